@@ -1,23 +1,70 @@
 import sqlite3
 import json
 import logging
-from typing import Optional, Any
+import threading
+from typing import Optional, Any, Dict, Iterable
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Per-connection tuning; the cache is read-heavy and can be rebuilt from providers,
+# so NORMAL sync under WAL is an acceptable durability trade-off.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+# Stay well below SQLite's default host-parameter limit (999).
+_GET_MANY_CHUNK = 500
+
 class SQLiteCache:
     """
     Simple Key-Value cache backed by SQLite.
     Schema: cache(key TEXT PRIMARY KEY, data TEXT, created_at TEXT)
+
+    Each instance lazily opens one connection, tuned once and shared across calls
+    and threads. With readonly=True it is a mode=ro connection and the cache never
+    creates or writes the database.
     """
-    def __init__(self, db_path: str = "finfetch_cache.db"):
+    def __init__(self, db_path: str = "finfetch_cache.db", *, readonly: bool = False):
         self.db_path = db_path
-        self._init_db()
+        self.readonly = readonly
+        self._conn: Optional[sqlite3.Connection] = None
+        # Serialises use of the shared connection (and transactions on it)
+        self._lock = threading.RLock()
+        if not readonly:
+            self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._conn is None:
+                if self.readonly:
+                    uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+                    conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+                else:
+                    conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                for pragma in _CONNECTION_PRAGMAS:
+                    conn.execute(pragma)
+                self._conn = conn
+            return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _missing(self) -> bool:
+        # A read-only cache over a not-yet-created file is simply empty
+        return self.readonly and self._conn is None and not Path(self.db_path).exists()
 
     def _init_db(self):
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock, self._connect() as conn:
+                # journal_mode is persistent, so it only needs setting once per file
+                conn.execute("PRAGMA journal_mode=WAL")
                 conn.execute("""
                     CREATE TABLE IF NOT EXISTS cache (
                         key TEXT PRIMARY KEY,
@@ -31,8 +78,10 @@ class SQLiteCache:
 
     def get(self, key: str) -> Optional[Any]:
         """Retrieve and parse JSON data from cache."""
+        if self._missing():
+            return None
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock, self._connect() as conn:
                 cursor = conn.execute("SELECT data FROM cache WHERE key = ?", (key,))
                 row = cursor.fetchone()
                 if row:
@@ -41,11 +90,35 @@ class SQLiteCache:
             logger.warning(f"Cache get failed for {key}: {e}")
         return None
 
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Retrieve and parse several keys in batched queries. Missing keys are omitted."""
+        unique = list(dict.fromkeys(keys))
+        results: Dict[str, Any] = {}
+        if not unique or self._missing():
+            return results
+        try:
+            with self._lock, self._connect() as conn:
+                for i in range(0, len(unique), _GET_MANY_CHUNK):
+                    chunk = unique[i:i + _GET_MANY_CHUNK]
+                    placeholders = ",".join("?" * len(chunk))
+                    cursor = conn.execute(
+                        f"SELECT key, data FROM cache WHERE key IN ({placeholders})",
+                        chunk,
+                    )
+                    for key, data in cursor.fetchall():
+                        results[key] = json.loads(data)
+        except Exception as e:
+            logger.warning(f"Cache get_many failed for {len(unique)} keys: {e}")
+        return results
+
     def put(self, key: str, value: Any):
         """Store data as JSON string."""
+        if self.readonly:
+            logger.error(f"Cache put skipped for {key}: cache is read-only")
+            return
         try:
             json_str = json.dumps(value)
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock, self._connect() as conn:
                 conn.execute("""
                     INSERT OR REPLACE INTO cache (key, data, created_at)
                     VALUES (?, ?, CURRENT_TIMESTAMP)
@@ -1,6 +1,11 @@
+import copy
 import os
 import logging
+import functools
 from pathlib import Path
+from typing import Any, Dict, Tuple
+
+import yaml
 
 # Naive dotenv loader since we want to avoid extra dependencies if possible,
 # or just assume user sources it. But Python standard way is `python-dotenv`.
@@ -9,6 +14,12 @@ from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# libyaml-backed loader when available; same safe semantics as yaml.safe_load
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Parsed YAML keyed on resolved path; reused while (mtime_ns, size) are unchanged
+_YAML_CACHE: Dict[str, Tuple[int, int, Any]] = {}
+
 def load_env_file(path: str = ".env"):
     """
     Load environment variables from a .env file into os.environ.
@@ -36,10 +47,30 @@ def load_env_file(path: str = ".env"):
 # Load on import
 load_env_file()
 
+@functools.lru_cache(maxsize=1)
 def get_finnhub_key() -> str:
-    """Get Finnhub API Key or raise error if missing."""
+    """
+    Get Finnhub API Key or raise error if missing.
+    Resolved once per process (after the .env load above); call
+    get_finnhub_key.cache_clear() if the environment changes.
+    """
     key = os.environ.get("FINNHUB_API_KEY")
     # Handle the template default left by user
     if not key or key == "your_key_here":
         return None
     return key
+
+def _load_yaml_cached(path: Path) -> Any:
+    """
+    Parse a YAML config file, reusing the previous parse while the file is unchanged.
+    Returns a deep copy so callers may mutate it; raises OSError / yaml.YAMLError.
+    """
+    st = path.stat()
+    key = str(path.resolve())
+    hit = _YAML_CACHE.get(key)
+    if hit is not None and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+        return copy.deepcopy(hit[2])
+    with path.open("rb") as f:
+        data = yaml.load(f, Loader=_YAML_LOADER)
+    _YAML_CACHE[key] = (st.st_mtime_ns, st.st_size, data)
+    return copy.deepcopy(data)
@@ -7,13 +7,14 @@ from ..cache.sqlite import SQLiteCache
 from .weekly import (
     _normalize_news,
     _weighted_sentiment,
-    _headline_sentiment,
+    _item_sentiment,
     _extract_themes,
     _build_prompt,
+    _iso,
 )
 
-# Initialize cache for reading
-cache = SQLiteCache()
+# Digest generation is cache-only, so share a single read-only handle
+cache = SQLiteCache(readonly=True)
 
 
 def _filter_news_last_24h(
@@ -64,7 +65,7 @@ def generate_daily_digest(
 
         yahoo_news = cache.get(f"yahoo:news:{ticker}:latest") or []
         finnhub_news = cache.get(f"finnhub:news:{ticker}:latest") or []
-        merged_news = _normalize_news(yahoo_news + finnhub_news)
+        merged_news = _normalize_news(yahoo_news, finnhub_news)
         daily_news = _filter_news_last_24h(merged_news, end_time=end_time)
         all_news.extend(daily_news)
 
@@ -89,13 +90,15 @@ def generate_daily_digest(
             "news": daily_news,
         }
 
-    lines = []
-    lines.append(title or f"# Daily Market Digest: {day_str}")
-    lines.append(f"**Date**: {day_str}")
-    lines.append("")
+    lines: List[str] = []
+    emit = lines.append
+
+    emit(title or f"# Daily Market Digest: {day_str}")
+    emit(f"**Date**: {day_str}")
+    emit("")
 
     # Market Snapshot
-    lines.append("## Market Snapshot")
+    emit("## Market Snapshot")
     changes = [d["change"] for d in ticker_data.values() if isinstance(d.get("change"), (int, float))]
     if changes:
         avg_change = sum(changes) / len(changes)
@@ -103,16 +106,16 @@ def generate_daily_digest(
         down = len([c for c in changes if c < 0])
         best = max(ticker_data.items(), key=lambda x: x[1].get("change") if x[1].get("change") is not None else -9999)
         worst = min(ticker_data.items(), key=lambda x: x[1].get("change") if x[1].get("change") is not None else 9999)
-        lines.append(f"- Daily breadth: {up} up / {down} down")
-        lines.append(f"- Average change: {avg_change:.2f}%")
-        lines.append(f"- Best performer: {best[0]} ({best[1].get('change'):.2f}%)")
-        lines.append(f"- Worst performer: {worst[0]} ({worst[1].get('change'):.2f}%)")
+        emit(f"- Daily breadth: {up} up / {down} down")
+        emit(f"- Average change: {avg_change:.2f}%")
+        emit(f"- Best performer: {best[0]} ({best[1].get('change'):.2f}%)")
+        emit(f"- Worst performer: {worst[0]} ({worst[1].get('change'):.2f}%)")
     else:
-        lines.append("- Not enough price data to summarize daily performance.")
-    lines.append("")
+        emit("- Not enough price data to summarize daily performance.")
+    emit("")
 
     # Sector Rotation
-    lines.append("## Sector Rotation")
+    emit("## Sector Rotation")
     sector_map: Dict[str, List[float]] = {}
     for ticker, data in ticker_data.items():
         sector = (data["fundamentals"] or {}).get("sector") or "Unknown"
@@ -125,24 +128,25 @@ def generate_daily_digest(
             sector_items.append((sector, sum(values) / len(values)))
         sector_items.sort(key=lambda x: (-x[1], x[0]))
         for sector, avg in sector_items:
-            lines.append(f"- {sector}: {avg:.2f}%")
+            emit(f"- {sector}: {avg:.2f}%")
     else:
-        lines.append("- Sector data not available.")
-    lines.append("")
+        emit("- Sector data not available.")
+    emit("")
 
     # Top Themes
-    lines.append("## Top Themes")
+    emit("## Top Themes")
     themes = _extract_themes(all_news)
     if themes:
         for word, count in themes:
-            lines.append(f"- {word} ({count})")
+            emit(f"- {word} ({count})")
     else:
-        lines.append("- No headline themes available.")
-    lines.append("")
+        emit("- No headline themes available.")
+    emit("")
 
+    market_items: List[Dict[str, Any]] = []
     if include_market_news:
         # Market News (broad, from Finnhub cache)
-        lines.append("## Market News")
+        emit("## Market News")
         market_news = cache.get("finnhub:market_news:general:0") or []
         market_items = _normalize_news(market_news)
         market_items = _filter_news_last_24h(market_items, end_time=end_time)
@@ -151,38 +155,38 @@ def generate_daily_digest(
                 title = item.get("title", "No Title")
                 source = item.get("source", "Unknown")
                 url = item.get("url", "#")
-                lines.append(f"- {source}: [{title}]({url})")
+                emit(f"- {source}: [{title}]({url})")
                 csv_rows.append({
                     "scope": "market",
                     "ticker": "",
                     "source": source,
                     "title": title,
                     "url": url,
-                    "published_at": (item.get("published_at") or "").isoformat() if isinstance(item.get("published_at"), datetime.datetime) else "",
+                    "published_at": _iso(item.get("published_at")),
                     "provider": item.get("provider", ""),
                 })
         else:
-            lines.append("- No cached market news for this date.")
-        lines.append("")
+            emit("- No cached market news for this date.")
+        emit("")
 
     # Ticker Highlights
-    lines.append("## Ticker Highlights")
+    emit("## Ticker Highlights")
     for ticker in tickers_sorted:
         data = ticker_data[ticker]
         fund = data["fundamentals"] or {}
         news = data["news"]
-        lines.append(f"### {ticker}")
+        emit(f"### {ticker}")
 
         name = fund.get("name", "Unknown")
         sector = fund.get("sector", "N/A")
         industry = fund.get("industry", "N/A")
-        lines.append(f"**{name}** | Sector: {sector} | Industry: {industry}")
+        emit(f"**{name}** | Sector: {sector} | Industry: {industry}")
 
         change = data.get("change")
         if isinstance(change, (int, float)) and data.get("start_price") and data.get("end_price"):
-            lines.append(f"- Daily change: {change:.2f}% ({data['start_price']:.2f} -> {data['end_price']:.2f})")
+            emit(f"- Daily change: {change:.2f}% ({data['start_price']:.2f} -> {data['end_price']:.2f})")
         else:
-            lines.append("- Daily change: N/A (Missing recent price history)")
+            emit("- Daily change: N/A (Missing recent price history)")
 
         # Sentiment
         sentiment_payload = cache.get(f"finnhub:sentiment:{ticker}:latest") or cache.get(f"finnhub:sentiment:{ticker}")
@@ -190,43 +194,48 @@ def generate_daily_digest(
             label = sentiment_payload.get("label") or sentiment_payload.get("sentiment") or "Unknown"
             score = sentiment_payload.get("score")
             score_str = f"{float(score):.2f}" if score is not None else "N/A"
-            lines.append(f"- Sentiment: {label} (Finnhub, score {score_str})")
+            emit(f"- Sentiment: {label} (Finnhub, score {score_str})")
+            data["sentiment"] = {"source": "finnhub", "label": label, "score": score}
         else:
             label, score = _weighted_sentiment(news)
-            lines.append(f"- Sentiment: {label} (weighted, score {score:.2f})")
+            emit(f"- Sentiment: {label} (weighted, score {score:.2f})")
+            data["sentiment"] = {"source": "weighted", "label": label, "score": score}
 
         # Headlines
         if news:
-            lines.append("- Key headlines:")
+            emit("- Key headlines:")
             for item in news[:3]:
                 title = item.get("title", "No Title")
                 source = item.get("source", "Unknown")
                 url = item.get("url", "#")
-                lines.append(f"  - {source}: [{title}]({url})")
+                emit(f"  - {source}: [{title}]({url})")
                 csv_rows.append({
                     "scope": "ticker",
                     "ticker": ticker,
                     "source": source,
                     "title": title,
                     "url": url,
-                    "published_at": (item.get("published_at") or "").isoformat() if isinstance(item.get("published_at"), datetime.datetime) else "",
+                    "published_at": _iso(item.get("published_at")),
                     "provider": item.get("provider", ""),
                 })
         else:
-            lines.append("- Key headlines: N/A")
+            emit("- Key headlines: N/A")
 
         # Risks / Catalysts (derived from headlines)
+        risks_catalysts = []
         if news:
-            lines.append("- Risks/Catalysts:")
+            emit("- Risks/Catalysts:")
             for item in news[:3]:
                 title = item.get("title", "")
-                tag = _headline_sentiment(title)
+                tag = _item_sentiment(item)
                 label = "Catalyst" if tag > 0 else "Risk" if tag < 0 else "Neutral"
-                lines.append(f"  - {label}: {title}")
+                emit(f"  - {label}: {title}")
+                risks_catalysts.append({"label": label, "title": title})
         else:
-            lines.append("- Risks/Catalysts: N/A")
+            emit("- Risks/Catalysts: N/A")
+        data["risks_catalysts"] = risks_catalysts
 
-        lines.append("")
+        emit("")
 
     with open(out_path, "w") as f:
         f.write("\n".join(lines))
@@ -238,8 +247,7 @@ def generate_daily_digest(
             fieldnames=["scope", "ticker", "source", "title", "url", "published_at", "provider"],
         )
         writer.writeheader()
-        for row in csv_rows:
-            writer.writerow(row)
+        writer.writerows(csv_rows)
 
     # Export prompt text alongside digest outputs
     prompt_title = (title or f"Daily Market Digest: {day_str}").replace("# ", "")
@@ -247,11 +255,6 @@ def generate_daily_digest(
     with open(prompt_path, "w") as f:
         f.write(prompt)
 
-    def _iso(dt: Any) -> str:
-        if isinstance(dt, datetime.datetime):
-            return dt.isoformat()
-        return ""
-
     market_snapshot = None
     if changes:
         market_snapshot = {
@@ -275,18 +278,14 @@ def generate_daily_digest(
     top_themes = [{"theme": word, "count": count} for word, count in themes] if themes else []
 
     market_news_payload = []
-    if include_market_news:
-        market_news = cache.get("finnhub:market_news:general:0") or []
-        market_items = _normalize_news(market_news)
-        market_items = _filter_news_last_24h(market_items, end_time=end_time)
-        for item in market_items[:5]:
-            market_news_payload.append({
-                "title": item.get("title", ""),
-                "source": item.get("source", "Unknown"),
-                "url": item.get("url", ""),
-                "published_at": _iso(item.get("published_at")),
-                "provider": item.get("provider", ""),
-            })
+    for item in market_items[:5]:
+        market_news_payload.append({
+            "title": item.get("title", ""),
+            "source": item.get("source", "Unknown"),
+            "url": item.get("url", ""),
+            "published_at": _iso(item.get("published_at")),
+            "provider": item.get("provider", ""),
+        })
 
     ticker_highlights = []
     for ticker in tickers_sorted:
@@ -294,23 +293,7 @@ def generate_daily_digest(
         fund = data["fundamentals"] or {}
         news = data["news"]
 
-        sentiment_payload = cache.get(f"finnhub:sentiment:{ticker}:latest") or cache.get(f"finnhub:sentiment:{ticker}")
-        if isinstance(sentiment_payload, dict):
-            sentiment = {
-                "source": "finnhub",
-                "label": sentiment_payload.get("label") or sentiment_payload.get("sentiment") or "Unknown",
-                "score": sentiment_payload.get("score"),
-            }
-        else:
-            label, score = _weighted_sentiment(news)
-            sentiment = {
-                "source": "weighted",
-                "label": label,
-                "score": score,
-            }
-
         headlines = []
-        risks_catalysts = []
         if news:
             for item in news[:3]:
                 title = item.get("title", "No Title")
@@ -321,9 +304,6 @@ def generate_daily_digest(
                     "published_at": _iso(item.get("published_at")),
                     "provider": item.get("provider", ""),
                 })
-                tag = _headline_sentiment(title)
-                label = "Catalyst" if tag > 0 else "Risk" if tag < 0 else "Neutral"
-                risks_catalysts.append({"label": label, "title": title})
 
         ticker_highlights.append({
             "ticker": ticker,
@@ -333,9 +313,9 @@ def generate_daily_digest(
             "change": data.get("change"),
             "start_price": data.get("start_price"),
             "end_price": data.get("end_price"),
-            "sentiment": sentiment,
+            "sentiment": data["sentiment"],
             "headlines": headlines,
-            "risks_catalysts": risks_catalysts,
+            "risks_catalysts": data["risks_catalysts"],
         })
 
     json_payload = {
@@ -349,13 +329,7 @@ def generate_daily_digest(
         "top_themes": top_themes,
         "market_news": market_news_payload,
         "ticker_highlights": ticker_highlights,
-        "news_links": [
-            {
-                **row,
-                "published_at": row.get("published_at") or "",
-            }
-            for row in csv_rows
-        ],
+        "news_links": csv_rows,
     }
 
     json_path = out_dir / f"daily_{day_str}.json"
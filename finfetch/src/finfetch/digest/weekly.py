@@ -1,39 +1,78 @@
 import csv
 import datetime
+import heapq
 import json
 import re
+import string
+from collections import Counter
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Collection, Optional, Tuple
 from ..cache.sqlite import SQLiteCache
 
-# Initialize cache for reading
-cache = SQLiteCache()
+try:
+    # C parser, much faster than fromisoformat over a week of cached news
+    from ciso8601 import parse_datetime as _parse_iso  # type: ignore
+except ImportError:
+    def _parse_iso(value: str) -> datetime.datetime:
+        # pydantic serializes aware UTC values with a trailing "Z", which
+        # fromisoformat only accepts from Python 3.11 on
+        if value.endswith("Z"):
+            value = value[:-1] + "+00:00"
+        return datetime.datetime.fromisoformat(value)
 
-_POS_WORDS = {
+# Digest generation is cache-only, so share a single read-only handle
+cache = SQLiteCache(readonly=True)
+
+_MARKET_NEWS_KEY = "finnhub:market_news:general:0"
+
+_POS_WORDS = frozenset({
     "beat", "beats", "surge", "surges", "soar", "soars", "soared",
     "record", "strong", "stronger", "growth", "profit", "profits",
     "up", "upgrade", "upgrades", "bull", "bullish", "raises", "raise",
     "accelerate", "accelerates", "wins", "win", "positive", "guidance"
-}
-_NEG_WORDS = {
+})
+_NEG_WORDS = frozenset({
     "miss", "misses", "slump", "slumps", "drop", "drops", "dropped",
     "weak", "weaker", "decline", "declines", "down", "downgrade",
     "downgrades", "bear", "bearish", "cuts", "cut", "slowdown",
     "loss", "losses", "negative", "warning", "warns"
-}
+})
 
-_STOP_WORDS = {
+_STOP_WORDS = frozenset({
     "the", "and", "for", "with", "from", "that", "this", "into", "over",
     "after", "before", "ahead", "amid", "as", "at", "by", "on", "in",
     "to", "of", "a", "an", "is", "are", "be", "its", "it", "their",
     "shares", "stock", "stocks", "company", "corp", "inc", "ltd",
     "co", "report", "reports", "quarter", "q1", "q2", "q3", "q4",
     "year", "years", "says", "said", "saying"
-}
+})
+
+# Float scales keep the comparisons and division float-to-float
+_COMPACT_SCALES = (
+    (1e12, "T"),
+    (1e9, "B"),
+    (1e6, "M"),
+    (1e3, "K"),
+)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+# ASCII fast path: map every non [a-z0-9] character to a space and split
+_TOKEN_KEEP = frozenset(string.ascii_lowercase + string.digits)
+_TOKEN_TRANS = str.maketrans({chr(c): " " for c in range(128) if chr(c) not in _TOKEN_KEEP})
+
+# Recency weight per whole day of headline age; the floor of 0.2 is reached by day 6
+_DECAY_DAYS = 7
+_DECAY = tuple(max(0.2, 1.0 - (d / 7.0)) for d in range(_DECAY_DAYS + 1))
+
+def _local_naive(dt: datetime.datetime) -> datetime.datetime:
+    """Digests compare naive local times; convert tz-aware provider timestamps to match."""
+    if dt.tzinfo is None:
+        return dt
+    return dt.astimezone().replace(tzinfo=None)
 
 def _parse_datetime(value: Any) -> Optional[datetime.datetime]:
     if isinstance(value, datetime.datetime):
-        return value
+        return _local_naive(value)
     if isinstance(value, (int, float)):
         try:
             return datetime.datetime.fromtimestamp(value)
@@ -41,11 +80,16 @@ def _parse_datetime(value: Any) -> Optional[datetime.datetime]:
             return None
     if isinstance(value, str):
         try:
-            return datetime.datetime.fromisoformat(value)
+            return _local_naive(_parse_iso(value))
         except Exception:
             return None
     return None
 
+def _iso(dt: Any) -> str:
+    if isinstance(dt, datetime.datetime):
+        return dt.isoformat()
+    return ""
+
 def _format_compact(value: Any, currency: Optional[str] = None) -> str:
     try:
         num = float(value)
@@ -53,14 +97,10 @@ def _format_compact(value: Any, currency: Optional[str] = None) -> str:
         return "N/A"
     sign = "-" if num < 0 else ""
     num = abs(num)
-    if num >= 1_000_000_000_000:
-        out = f"{sign}{num / 1_000_000_000_000:.2f}T"
-    elif num >= 1_000_000_000:
-        out = f"{sign}{num / 1_000_000_000:.2f}B"
-    elif num >= 1_000_000:
-        out = f"{sign}{num / 1_000_000:.2f}M"
-    elif num >= 1_000:
-        out = f"{sign}{num / 1_000:.2f}K"
+    for scale, suffix in _COMPACT_SCALES:
+        if num >= scale:
+            out = f"{sign}{num / scale:.2f}{suffix}"
+            break
     else:
         out = f"{sign}{num:.2f}"
     if currency:
@@ -75,34 +115,77 @@ def _format_ratio(value: Any) -> str:
 
 def _get_first_key(data: Dict[str, Any], keys: List[str]) -> Any:
     for key in keys:
-        if key in data and data.get(key) is not None:
-            return data.get(key)
+        value = data.get(key)
+        if value is not None:
+            return value
     return None
 
-def _normalize_news(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def _news_sort_key(item: Dict[str, Any]) -> datetime.datetime:
+    return item.get("published_at") or datetime.datetime.min
+
+def _normalize_feed(items: List[Dict[str, Any]], seen: set) -> List[Dict[str, Any]]:
+    """De-duplicate and parse one provider feed, newest first."""
     normalized = []
-    seen = set()
     for item in items:
         key = item.get("id") or item.get("url") or item.get("title")
         if key in seen:
             continue
         seen.add(key)
         dt = _parse_datetime(item.get("published_at") or item.get("publishedAt"))
+        title = item.get("title", "")
+        tokens = _tokenize(title)
         normalized.append({
             "id": item.get("id"),
-            "title": item.get("title", ""),
+            "title": title,
             "url": item.get("url", ""),
             "source": item.get("source", "Unknown"),
             "published_at": dt,
-            "provider": item.get("provider", "unknown")
+            "provider": item.get("provider", "unknown"),
+            # Tokenized and scored once here; shared by sentiment, theme and risk scans
+            "_tokens": tokens,
+            "_sentiment": _headline_sentiment(tokens),
         })
-    normalized.sort(key=lambda x: x.get("published_at") or datetime.datetime.min, reverse=True)
+    # Cached feeds are usually stored newest-first already; only sort when they are not
+    if any(_news_sort_key(a) < _news_sort_key(b) for a, b in zip(normalized, normalized[1:])):
+        normalized.sort(key=_news_sort_key, reverse=True)
     return normalized
 
-def _headline_sentiment(title: str) -> int:
-    words = set(re.findall(r"[a-z0-9]+", title.lower()))
-    pos = any(w in _POS_WORDS for w in words)
-    neg = any(w in _NEG_WORDS for w in words)
+def _normalize_news(*feeds: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Normalize one or more news feeds into a single de-duplicated list, newest first.
+    Earlier feeds win on duplicates and on equal timestamps.
+    """
+    seen: set = set()
+    normalized = [_normalize_feed(feed, seen) for feed in feeds]
+    if len(normalized) == 1:
+        return normalized[0]
+    return list(heapq.merge(*normalized, key=_news_sort_key, reverse=True))
+
+def _tokenize(title: Optional[str]) -> List[str]:
+    if not title:
+        return []
+    lowered = title.lower()
+    if lowered.isascii():
+        return lowered.translate(_TOKEN_TRANS).split()
+    return _TOKEN_RE.findall(lowered)
+
+def _item_tokens(item: Dict[str, Any]) -> List[str]:
+    tokens = item.get("_tokens")
+    if tokens is None:
+        tokens = _tokenize(item.get("title"))
+    return tokens
+
+def _item_sentiment(item: Dict[str, Any]) -> int:
+    sentiment = item.get("_sentiment")
+    if sentiment is None:
+        sentiment = _headline_sentiment(_item_tokens(item))
+    return sentiment
+
+def _headline_sentiment(tokens: Collection[str]) -> int:
+    if not tokens:
+        return 0
+    pos = not _POS_WORDS.isdisjoint(tokens)
+    neg = not _NEG_WORDS.isdisjoint(tokens)
     if pos and not neg:
         return 1
     if neg and not pos:
@@ -116,11 +199,11 @@ def _weighted_sentiment(news: List[Dict[str, Any]]) -> Tuple[str, float]:
     score_sum = 0.0
     now = datetime.datetime.now()
     for item in news:
-        sentiment = _headline_sentiment(item.get("title", ""))
+        sentiment = _item_sentiment(item)
         dt = item.get("published_at")
         if isinstance(dt, datetime.datetime):
-            days = max(0.0, (now - dt).days)
-            weight = max(0.2, 1.0 - (days / 7.0))
+            days = min(_DECAY_DAYS, max(0, (now - dt).days))
+            weight = _DECAY[days]
         else:
             weight = 0.5
         total_weight += weight
@@ -135,15 +218,11 @@ def _weighted_sentiment(news: List[Dict[str, Any]]) -> Tuple[str, float]:
     return ("Neutral", score)
 
 def _extract_themes(news: List[Dict[str, Any]], limit: int = 6) -> List[Tuple[str, int]]:
-    counts: Dict[str, int] = {}
+    counts: Counter = Counter()
     for item in news:
-        words = re.findall(r"[a-z0-9]+", item.get("title", "").lower())
-        for w in words:
-            if len(w) < 3 or w in _STOP_WORDS:
-                continue
-            counts[w] = counts.get(w, 0) + 1
-    items = sorted(counts.items(), key=lambda x: (-x[1], x[0]))
-    return items[:limit]
+        counts.update(w for w in _item_tokens(item) if len(w) >= 3 and w not in _STOP_WORDS)
+    # Counter.most_common breaks ties by insertion order; keep the alphabetical tie-break
+    return heapq.nsmallest(limit, counts.items(), key=lambda x: (-x[1], x[0]))
 
 def _build_prompt(title: str, rows: List[Dict[str, str]], *, digest_date: Optional[datetime.date] = None) -> str:
     day = digest_date or datetime.date.today()
@@ -181,6 +260,51 @@ def _build_prompt(title: str, rows: List[Dict[str, str]], *, digest_date: Option
         idx += 1
     return "\n".join(lines)
 
+def _ticker_keys(ticker: str) -> Tuple[str, str, str, str, str, str]:
+    """
+    Cache keys read per ticker: fundamentals, prices, yahoo news, finnhub news,
+    finnhub sentiment (latest), finnhub sentiment (legacy key).
+    """
+    return (
+        f"yahoo:fundamentals:{ticker}",
+        f"yahoo:prices:{ticker}:5d:1d",
+        f"yahoo:news:{ticker}:latest",
+        f"finnhub:news:{ticker}:latest",
+        f"finnhub:sentiment:{ticker}:latest",
+        f"finnhub:sentiment:{ticker}",
+    )
+
+def _assemble_ticker(keys: Tuple[str, ...], cached: Dict[str, Any]) -> Dict[str, Any]:
+    """Build one ticker's digest inputs from pre-fetched cache entries (no I/O)."""
+    fund_key, prices_key, yahoo_news_key, finnhub_news_key = keys[:4]
+    fund = cached.get(fund_key) or {}
+    prices = cached.get(prices_key) or []
+
+    yahoo_news = cached.get(yahoo_news_key) or []
+    finnhub_news = cached.get(finnhub_news_key) or []
+    merged_news = _normalize_news(yahoo_news, finnhub_news)
+
+    change = None
+    start_price = None
+    end_price = None
+    if prices and len(prices) >= 2:
+        start_price = prices[0].get("close")
+        end_price = prices[-1].get("close")
+        try:
+            if start_price:
+                change = ((end_price - start_price) / start_price) * 100
+        except Exception:
+            change = None
+
+    return {
+        "fundamentals": fund,
+        "prices": prices,
+        "change": change,
+        "start_price": start_price,
+        "end_price": end_price,
+        "news": merged_news
+    }
+
 def generate_weekly_digest(tickers: List[str], out_dir: Path, *, title: Optional[str] = None, include_market_news: bool = True) -> Path:
     """
     Generate a weekly digest markdown file for a list of tickers.
@@ -202,186 +326,199 @@ def generate_weekly_digest(tickers: List[str], out_dir: Path, *, title: Optional
     all_news: List[Dict[str, Any]] = []
     csv_rows: List[Dict[str, str]] = []
 
-    for ticker in tickers_sorted:
-        fund = cache.get(f"yahoo:fundamentals:{ticker}") or {}
-        prices = cache.get(f"yahoo:prices:{ticker}:5d:1d") or []
-
-        yahoo_news = cache.get(f"yahoo:news:{ticker}:latest") or []
-        finnhub_news = cache.get(f"finnhub:news:{ticker}:latest") or []
-        merged_news = _normalize_news(yahoo_news + finnhub_news)
-        all_news.extend(merged_news)
-
-        change = None
-        start_price = None
-        end_price = None
-        if prices and len(prices) >= 2:
-            start_price = prices[0].get("close")
-            end_price = prices[-1].get("close")
-            try:
-                if start_price:
-                    change = ((end_price - start_price) / start_price) * 100
-            except Exception:
-                change = None
-
-        ticker_data[ticker] = {
-            "fundamentals": fund,
-            "prices": prices,
-            "change": change,
-            "start_price": start_price,
-            "end_price": end_price,
-            "news": merged_news
-        }
-
-    lines = []
-    lines.append(title or f"# Weekly Market Digest: {year}-W{week:02d}")
-    lines.append(f"**Date**: {today_str}")
-    lines.append("")
-
-    # Market Snapshot
-    lines.append("## Market Snapshot")
-    changes = [d["change"] for d in ticker_data.values() if isinstance(d.get("change"), (int, float))]
-    if changes:
-        avg_change = sum(changes) / len(changes)
-        up = len([c for c in changes if c >= 0])
-        down = len([c for c in changes if c < 0])
-        best = max(ticker_data.items(), key=lambda x: x[1].get("change") if x[1].get("change") is not None else -9999)
-        worst = min(ticker_data.items(), key=lambda x: x[1].get("change") if x[1].get("change") is not None else 9999)
-        lines.append(f"- Weekly breadth: {up} up / {down} down")
-        lines.append(f"- Average change: {avg_change:.2f}%")
-        lines.append(f"- Best performer: {best[0]} ({best[1].get('change'):.2f}%)")
-        lines.append(f"- Worst performer: {worst[0]} ({worst[1].get('change'):.2f}%)")
-    else:
-        lines.append("- Not enough price data to summarize weekly performance.")
-    lines.append("")
-
-    # Sector Rotation
-    lines.append("## Sector Rotation")
-    sector_map: Dict[str, List[float]] = {}
-    for ticker, data in ticker_data.items():
-        sector = (data["fundamentals"] or {}).get("sector") or "Unknown"
-        change = data.get("change")
-        if isinstance(change, (int, float)):
-            sector_map.setdefault(sector, []).append(change)
-    if sector_map:
-        sector_items = []
-        for sector, values in sector_map.items():
-            sector_items.append((sector, sum(values) / len(values)))
-        sector_items.sort(key=lambda x: (-x[1], x[0]))
-        for sector, avg in sector_items:
-            lines.append(f"- {sector}: {avg:.2f}%")
-    else:
-        lines.append("- Sector data not available.")
-    lines.append("")
-
-    # Top Themes
-    lines.append("## Top Themes")
-    themes = _extract_themes(all_news)
-    if themes:
-        for word, count in themes:
-            lines.append(f"- {word} ({count})")
-    else:
-        lines.append("- No headline themes available.")
-    lines.append("")
-
-    if include_market_news:
-        # Market News (broad, from Finnhub cache)
-        lines.append("## Market News")
-        market_news = cache.get("finnhub:market_news:general:0") or []
-        market_items = _normalize_news(market_news)
-        if market_items:
-            for item in market_items[:5]:
-                title = item.get("title", "No Title")
-                source = item.get("source", "Unknown")
-                url = item.get("url", "#")
-                lines.append(f"- {source}: [{title}]({url})")
-                csv_rows.append({
-                    "scope": "market",
-                    "ticker": "",
-                    "source": source,
-                    "title": title,
-                    "url": url,
-                    "published_at": (item.get("published_at") or "").isoformat() if isinstance(item.get("published_at"), datetime.datetime) else "",
-                    "provider": item.get("provider", "")
-                })
-        else:
-            lines.append("- No cached market news.")
-        lines.append("")
+    # Read every cache entry the digest needs in one batched lookup
+    keys_by_ticker = {ticker: _ticker_keys(ticker) for ticker in tickers_sorted}
+    keys = [_MARKET_NEWS_KEY]
+    for ticker_keys in keys_by_ticker.values():
+        keys.extend(ticker_keys)
+    cached = cache.get_many(keys)
 
-    # Ticker Highlights
-    lines.append("## Ticker Highlights")
     for ticker in tickers_sorted:
-        data = ticker_data[ticker]
-        fund = data["fundamentals"] or {}
-        news = data["news"]
-        lines.append(f"### {ticker}")
-
-        name = fund.get("name", "Unknown")
-        sector = fund.get("sector", "N/A")
-        industry = fund.get("industry", "N/A")
-        lines.append(f"**{name}** | Sector: {sector} | Industry: {industry}")
-
-        change = data.get("change")
-        if isinstance(change, (int, float)) and data.get("start_price") and data.get("end_price"):
-            lines.append(f"- Weekly change: {change:.2f}% ({data['start_price']:.2f} -> {data['end_price']:.2f})")
+        data = _assemble_ticker(keys_by_ticker[ticker], cached)
+        ticker_data[ticker] = data
+        all_news.extend(data["news"])
+
+    # News links CSV (market + ticker headlines) is streamed; the markdown is joined once at the end
+    with open(out_path, "w") as md_file, open(csv_path, "w", newline="") as csv_file:
+        csv_writer = csv.DictWriter(
+            csv_file,
+            fieldnames=["scope", "ticker", "source", "title", "url", "published_at", "provider"]
+        )
+        csv_writer.writeheader()
+
+        def add_link(row: Dict[str, str]) -> None:
+            csv_rows.append(row)
+            csv_writer.writerow(row)
+
+        lines: List[str] = []
+        emit = lines.append
+
+        emit(title or f"# Weekly Market Digest: {year}-W{week:02d}")
+        emit(f"**Date**: {today_str}")
+        emit("")
+
+        # Market Snapshot
+        emit("## Market Snapshot")
+        # Breadth, average, best and worst in a single pass; ties keep the first ticker
+        change_count = 0
+        change_total = 0.0
+        up = down = 0
+        best: Tuple[Optional[str], float] = (None, float("-inf"))
+        worst: Tuple[Optional[str], float] = (None, float("inf"))
+        for ticker, data in ticker_data.items():
+            change = data.get("change")
+            if not isinstance(change, (int, float)):
+                continue
+            change_count += 1
+            change_total += change
+            if change >= 0:
+                up += 1
+            else:
+                down += 1
+            if change > best[1]:
+                best = (ticker, change)
+            if change < worst[1]:
+                worst = (ticker, change)
+        if change_count:
+            avg_change = change_total / change_count
+            emit(f"- Weekly breadth: {up} up / {down} down")
+            emit(f"- Average change: {avg_change:.2f}%")
+            emit(f"- Best performer: {best[0]} ({best[1]:.2f}%)")
+            emit(f"- Worst performer: {worst[0]} ({worst[1]:.2f}%)")
         else:
-            lines.append("- Weekly change: N/A (Missing 5d price history)")
-
-        # Sentiment
-        sentiment_payload = cache.get(f"finnhub:sentiment:{ticker}:latest") or cache.get(f"finnhub:sentiment:{ticker}")
-        if isinstance(sentiment_payload, dict):
-            label = sentiment_payload.get("label") or sentiment_payload.get("sentiment") or "Unknown"
-            score = sentiment_payload.get("score")
-            score_str = _format_ratio(score) if score is not None else "N/A"
-            lines.append(f"- Sentiment: {label} (Finnhub, score {score_str})")
+            emit("- Not enough price data to summarize weekly performance.")
+        emit("")
+
+        # Sector Rotation
+        emit("## Sector Rotation")
+        sector_map: Dict[str, List[float]] = {}
+        for ticker, data in ticker_data.items():
+            sector = (data["fundamentals"] or {}).get("sector") or "Unknown"
+            change = data.get("change")
+            if isinstance(change, (int, float)):
+                sector_map.setdefault(sector, []).append(change)
+        if sector_map:
+            sector_items = []
+            for sector, values in sector_map.items():
+                sector_items.append((sector, sum(values) / len(values)))
+            sector_items.sort(key=lambda x: (-x[1], x[0]))
+            for sector, avg in sector_items:
+                emit(f"- {sector}: {avg:.2f}%")
         else:
-            label, score = _weighted_sentiment(news)
-            lines.append(f"- Sentiment: {label} (weighted, score {score:.2f})")
-
-        # Headlines
-        if news:
-            lines.append("- Key headlines:")
-            for item in news[:3]:
-                title = item.get("title", "No Title")
-                source = item.get("source", "Unknown")
-                url = item.get("url", "#")
-                lines.append(f"  - {source}: [{title}]({url})")
-                csv_rows.append({
-                    "scope": "ticker",
-                    "ticker": ticker,
-                    "source": source,
-                    "title": title,
-                    "url": url,
-                    "published_at": (item.get("published_at") or "").isoformat() if isinstance(item.get("published_at"), datetime.datetime) else "",
-                    "provider": item.get("provider", "")
-                })
+            emit("- Sector data not available.")
+        emit("")
+
+        # Top Themes
+        emit("## Top Themes")
+        themes = _extract_themes(all_news)
+        if themes:
+            for word, count in themes:
+                emit(f"- {word} ({count})")
         else:
-            lines.append("- Key headlines: N/A")
-
-        # Risks / Catalysts (derived from headlines)
-        if news:
-            lines.append("- Risks/Catalysts:")
-            for item in news[:3]:
-                title = item.get("title", "")
-                tag = _headline_sentiment(title)
-                label = "Catalyst" if tag > 0 else "Risk" if tag < 0 else "Neutral"
-                lines.append(f"  - {label}: {title}")
-        else:
-            lines.append("- Risks/Catalysts: N/A")
-
-        lines.append("")
-        
-    with open(out_path, 'w') as f:
-        f.write("\n".join(lines))
-
-    # Export news links CSV (market + ticker headlines)
-    with open(csv_path, "w", newline="") as f:
-        writer = csv.DictWriter(
-            f,
-            fieldnames=["scope", "ticker", "source", "title", "url", "published_at", "provider"]
-        )
-        writer.writeheader()
-        for row in csv_rows:
-            writer.writerow(row)
+            emit("- No headline themes available.")
+        emit("")
+
+        market_items: List[Dict[str, Any]] = []
+        if include_market_news:
+            # Market News (broad, from Finnhub cache)
+            emit("## Market News")
+            market_news = cached.get(_MARKET_NEWS_KEY) or []
+            market_items = _normalize_news(market_news)
+            if market_items:
+                for item in market_items[:5]:
+                    title = item.get("title", "No Title")
+                    source = item.get("source", "Unknown")
+                    url = item.get("url", "#")
+                    emit(f"- {source}: [{title}]({url})")
+                    add_link({
+                        "scope": "market",
+                        "ticker": "",
+                        "source": source,
+                        "title": title,
+                        "url": url,
+                        "published_at": _iso(item.get("published_at")),
+                        "provider": item.get("provider", "")
+                    })
+            else:
+                emit("- No cached market news.")
+            emit("")
+
+        # Ticker Highlights
+        emit("## Ticker Highlights")
+        for ticker in tickers_sorted:
+            data = ticker_data[ticker]
+            fund = data["fundamentals"] or {}
+            news = data["news"]
+
+            name = fund.get("name", "Unknown")
+            sector = fund.get("sector", "N/A")
+            industry = fund.get("industry", "N/A")
+
+            change = data.get("change")
+            if isinstance(change, (int, float)) and data.get("start_price") and data.get("end_price"):
+                change_str = f"{change:.2f}% ({data['start_price']:.2f} -> {data['end_price']:.2f})"
+            else:
+                change_str = "N/A (Missing 5d price history)"
+
+            # Sentiment
+            ticker_keys = keys_by_ticker[ticker]
+            sentiment_payload = cached.get(ticker_keys[4]) or cached.get(ticker_keys[5])
+            if isinstance(sentiment_payload, dict):
+                label = sentiment_payload.get("label") or sentiment_payload.get("sentiment") or "Unknown"
+                score = sentiment_payload.get("score")
+                score_str = _format_ratio(score) if score is not None else "N/A"
+                sentiment_str = f"{label} (Finnhub, score {score_str})"
+                data["sentiment"] = {"source": "finnhub", "label": label, "score": score}
+            else:
+                label, score = _weighted_sentiment(news)
+                sentiment_str = f"{label} (weighted, score {score:.2f})"
+                data["sentiment"] = {"source": "weighted", "label": label, "score": score}
+
+            # Fixed-shape ticker header in a single write; headlines below stay line by line
+            emit(
+                f"### {ticker}\n"
+                f"**{name}** | Sector: {sector} | Industry: {industry}\n"
+                f"- Weekly change: {change_str}\n"
+                f"- Sentiment: {sentiment_str}"
+            )
+
+            # Headlines
+            if news:
+                emit("- Key headlines:")
+                for item in news[:3]:
+                    title = item.get("title", "No Title")
+                    source = item.get("source", "Unknown")
+                    url = item.get("url", "#")
+                    emit(f"  - {source}: [{title}]({url})")
+                    add_link({
+                        "scope": "ticker",
+                        "ticker": ticker,
+                        "source": source,
+                        "title": title,
+                        "url": url,
+                        "published_at": _iso(item.get("published_at")),
+                        "provider": item.get("provider", "")
+                    })
+            else:
+                emit("- Key headlines: N/A")
+
+            # Risks / Catalysts (derived from headlines)
+            risks_catalysts = []
+            if news:
+                emit("- Risks/Catalysts:")
+                for item in news[:3]:
+                    title = item.get("title", "")
+                    tag = _item_sentiment(item)
+                    label = "Catalyst" if tag > 0 else "Risk" if tag < 0 else "Neutral"
+                    emit(f"  - {label}: {title}")
+                    risks_catalysts.append({"label": label, "title": title})
+            else:
+                emit("- Risks/Catalysts: N/A")
+            data["risks_catalysts"] = risks_catalysts
+
+            emit("")
+
+        md_file.write("\n".join(lines))
 
     # Export prompt text alongside digest outputs
     prompt_title = (title or f"Weekly Market Digest: {year}-W{week:02d}").replace("# ", "")
@@ -389,18 +526,13 @@ def generate_weekly_digest(tickers: List[str], out_dir: Path, *, title: Optional
     with open(prompt_path, "w") as f:
         f.write(prompt)
 
-    def _iso(dt: Any) -> str:
-        if isinstance(dt, datetime.datetime):
-            return dt.isoformat()
-        return ""
-
     market_snapshot = None
-    if changes:
+    if change_count:
         market_snapshot = {
             "breadth": {"up": up, "down": down},
             "average_change": avg_change,
-            "best": {"ticker": best[0], "change": best[1].get("change")},
-            "worst": {"ticker": worst[0], "change": worst[1].get("change")},
+            "best": {"ticker": best[0], "change": best[1]},
+            "worst": {"ticker": worst[0], "change": worst[1]},
         }
     else:
         market_snapshot = {"note": "Not enough price data to summarize weekly performance."}
@@ -417,17 +549,14 @@ def generate_weekly_digest(tickers: List[str], out_dir: Path, *, title: Optional
     top_themes = [{"theme": word, "count": count} for word, count in themes] if themes else []
 
     market_news_payload = []
-    if include_market_news:
-        market_news = cache.get("finnhub:market_news:general:0") or []
-        market_items = _normalize_news(market_news)
-        for item in market_items[:5]:
-            market_news_payload.append({
-                "title": item.get("title", ""),
-                "source": item.get("source", "Unknown"),
-                "url": item.get("url", ""),
-                "published_at": _iso(item.get("published_at")),
-                "provider": item.get("provider", ""),
-            })
+    for item in market_items[:5]:
+        market_news_payload.append({
+            "title": item.get("title", ""),
+            "source": item.get("source", "Unknown"),
+            "url": item.get("url", ""),
+            "published_at": _iso(item.get("published_at")),
+            "provider": item.get("provider", ""),
+        })
 
     ticker_highlights = []
     for ticker in tickers_sorted:
@@ -435,23 +564,7 @@ def generate_weekly_digest(tickers: List[str], out_dir: Path, *, title: Optional
         fund = data["fundamentals"] or {}
         news = data["news"]
 
-        sentiment_payload = cache.get(f"finnhub:sentiment:{ticker}:latest") or cache.get(f"finnhub:sentiment:{ticker}")
-        if isinstance(sentiment_payload, dict):
-            sentiment = {
-                "source": "finnhub",
-                "label": sentiment_payload.get("label") or sentiment_payload.get("sentiment") or "Unknown",
-                "score": sentiment_payload.get("score"),
-            }
-        else:
-            label, score = _weighted_sentiment(news)
-            sentiment = {
-                "source": "weighted",
-                "label": label,
-                "score": score,
-            }
-
         headlines = []
-        risks_catalysts = []
         if news:
             for item in news[:3]:
                 title = item.get("title", "No Title")
@@ -462,9 +575,6 @@ def generate_weekly_digest(tickers: List[str], out_dir: Path, *, title: Optional
                     "published_at": _iso(item.get("published_at")),
                     "provider": item.get("provider", ""),
                 })
-                tag = _headline_sentiment(title)
-                label = "Catalyst" if tag > 0 else "Risk" if tag < 0 else "Neutral"
-                risks_catalysts.append({"label": label, "title": title})
 
         ticker_highlights.append({
             "ticker": ticker,
@@ -474,9 +584,9 @@ def generate_weekly_digest(tickers: List[str], out_dir: Path, *, title: Optional
             "change": data.get("change"),
             "start_price": data.get("start_price"),
             "end_price": data.get("end_price"),
-            "sentiment": sentiment,
+            "sentiment": data["sentiment"],
             "headlines": headlines,
-            "risks_catalysts": risks_catalysts,
+            "risks_catalysts": data["risks_catalysts"],
         })
 
     json_payload = {
@@ -491,13 +601,7 @@ def generate_weekly_digest(tickers: List[str], out_dir: Path, *, title: Optional
         "top_themes": top_themes,
         "market_news": market_news_payload,
         "ticker_highlights": ticker_highlights,
-        "news_links": [
-            {
-                **row,
-                "published_at": row.get("published_at") or "",
-            }
-            for row in csv_rows
-        ],
+        "news_links": csv_rows,
     }
 
     json_path = out_dir / f"weekly_{year}-W{week:02d}.json"
@@ -1,4 +1,5 @@
 import json
+import os
 import traceback
 
 class FinFetchError(Exception):
@@ -20,8 +21,12 @@ class UnknownError(FinFetchError):
     """Unexpected errors"""
     pass
 
-def format_error(e: Exception) -> str:
-    """Format exception as JSON string per RULES.md"""
+def format_error(e: Exception, verbose: bool = False) -> str:
+    """
+    Format exception as JSON string per RULES.md.
+    Tracebacks for unexpected errors are only included when verbose=True
+    or FINFETCH_TRACEBACK=1, so the common error path skips walking the stack.
+    """
     
     if isinstance(e, FinFetchError):
         error_type = e.__class__.__name__
@@ -30,9 +35,10 @@ def format_error(e: Exception) -> str:
     else:
         error_type = "UnknownError"
         message = str(e)
-        details = {
-            "traceback": traceback.format_exc().splitlines()
-        }
+        details = {}
+        if verbose or os.getenv("FINFETCH_TRACEBACK") == "1":
+            lines = traceback.format_exception(type(e), e, e.__traceback__)
+            details["traceback"] = "".join(lines).splitlines()
 
     payload = {
         "ok": False,
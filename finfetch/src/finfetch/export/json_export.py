@@ -2,9 +2,13 @@ import json
 from pathlib import Path
 from typing import Any
 
-def export_json(data: Any, path: Path):
+def export_json(data: Any, path: Path, *, indent: int = 2, sort_keys: bool = True, compact: bool = False):
     """
     Export data to JSON file.
+    compact=True drops indentation and separator whitespace for large archival payloads.
     """
     with open(path, 'w') as f:
-        json.dump(data, f, indent=2, sort_keys=True, default=str)
+        if compact:
+            json.dump(data, f, separators=(",", ":"), sort_keys=sort_keys, default=str)
+        else:
+            json.dump(data, f, indent=indent, sort_keys=sort_keys, default=str)
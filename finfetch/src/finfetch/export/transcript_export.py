@@ -45,7 +45,7 @@ def export_transcript(transcript: Dict[str, Any], out_root: str = "./exports") -
     json_path = export_dir / f"{base}.json"
     md_path = export_dir / f"{base}.md"
 
-    json_export.export_json(transcript, json_path)
+    json_export.export_json(transcript, json_path, compact=True)
     md_export.export_transcript_md(transcript, md_path)
 
     return {"json": str(json_path), "markdown": str(md_path)}
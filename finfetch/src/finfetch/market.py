@@ -1,8 +1,16 @@
 from pathlib import Path
-from typing import Dict, Any
+from typing import Annotated, List, Dict, Any
 import yaml
+from pydantic import StrictStr, StringConstraints, TypeAdapter
+from pydantic import ValidationError as PydanticValidationError
+from .config import _load_yaml_cached
 from .errors import ValidationError
 
+# Ticker list validation/normalization (strip + upper) runs inside pydantic-core
+_TICKERS_ADAPTER = TypeAdapter(
+    List[Annotated[StrictStr, StringConstraints(strip_whitespace=True, to_upper=True, min_length=1)]]
+)
+
 
 def load_market(path: str = "market.yaml") -> Dict[str, Any]:
     """
@@ -17,8 +25,8 @@ def load_market(path: str = "market.yaml") -> Dict[str, Any]:
         raise ValidationError(f"Market file not found: {path}")
 
     try:
-        data = yaml.safe_load(p.read_text()) or {}
-    except Exception as e:
+        data = _load_yaml_cached(p) or {}
+    except (OSError, yaml.YAMLError) as e:
         raise ValidationError(f"Invalid market YAML: {e}")
 
     if "market" not in data or not isinstance(data["market"], dict):
@@ -31,10 +39,9 @@ def load_market(path: str = "market.yaml") -> Dict[str, Any]:
     if not isinstance(tickers, list) or not tickers:
         raise ValidationError("'market.tickers' must be a non-empty list.")
 
-    norm = []
-    for t in tickers:
-        if not isinstance(t, str) or not t.strip():
-            raise ValidationError("All tickers must be non-empty strings.")
-        norm.append(t.strip().upper())
+    try:
+        norm = _TICKERS_ADAPTER.validate_python(tickers)
+    except PydanticValidationError:
+        raise ValidationError("All tickers must be non-empty strings.")
 
     return {"name": name, "tickers": norm}
@@ -1,17 +1,19 @@
 from datetime import datetime
-from typing import Optional, List
-from pydantic import BaseModel
+from typing import Optional, Tuple
+from pydantic import BaseModel, ConfigDict, Field
 
 class NewsItem(BaseModel):
     """
     Normalized news item.
     """
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     id: str  # Stable hash
     title: str
     url: str
     published_at: datetime
     source: str
     summary: Optional[str] = None
-    tickers: List[str] = []
+    tickers: Tuple[str, ...] = Field(default_factory=tuple)
     
     provider: str = "yahoo"
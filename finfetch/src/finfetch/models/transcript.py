@@ -1,6 +1,7 @@
 from datetime import date, datetime
+from functools import cached_property
 from typing import List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, computed_field
 
 
 class TranscriptSection(BaseModel):
@@ -24,5 +25,10 @@ class Transcript(BaseModel):
     published_at: Optional[datetime] = None
     speakers: List[str] = Field(default_factory=list)
     sections: List[TranscriptSection] = Field(default_factory=list)
-    full_text: str = ""
-    raw_html: Optional[str] = None
+    raw_html: Optional[str] = Field(default=None, repr=False)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @cached_property
+    def full_text(self) -> str:
+        """Section texts joined on blank lines; derived so the body is not held twice."""
+        return "\n\n".join(sec.text for sec in self.sections if sec.text)
@@ -1,64 +1,106 @@
 import requests
 import logging
 import datetime
-import re
 import os
-from typing import List, Optional
+import threading
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import List, Tuple
+
+try:
+    import orjson  # type: ignore
+    _loads = orjson.loads
+except ImportError:
+    import json
+    _loads = json.loads
 from ..errors import ProviderError
 from ..models.news import NewsItem
 from ..config import get_finnhub_key
+from .links import FINNHUB_NEWS_PREFIXES, resolve_finnhub_link
+from .session import build_session
 
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://finnhub.io/api/v1"
+_URL_COMPANY = f"{BASE_URL}/company-news"
+_URL_MARKET = f"{BASE_URL}/news"
 
-_FINNHUB_NEWS_RE = re.compile(r"^https?://finnhub\.io/api/news\?id=")
-
-def _extract_canonical_url(html_text: str) -> Optional[str]:
-    for pat in (
-        r'rel=\"canonical\" href=\"([^\"]+)\"',
-        r'property=\"og:url\" content=\"([^\"]+)\"',
-        r'name=\"og:url\" content=\"([^\"]+)\"'
-    ):
-        m = re.search(pat, html_text)
-        if m:
-            return m.group(1).strip()
-    return None
-
-def _resolve_finnhub_link(url: str) -> str:
-    if not url or not _FINNHUB_NEWS_RE.match(url):
-        return url
-    try:
-        resp = requests.get(
-            url,
-            headers={"User-Agent": "Mozilla/5.0"},
-            allow_redirects=False,
-            timeout=10
-        )
-        if resp.status_code in (301, 302, 303, 307, 308):
-            loc = resp.headers.get("Location")
-            if loc:
-                return loc
-        if resp.status_code == 200:
-            resolved = _extract_canonical_url(resp.text)
-            return resolved or url
-    except Exception:
-        pass
-    # Headless fallback for finnhub redirect pages
-    try:
-        from playwright.sync_api import sync_playwright  # type: ignore
-        timeout_ms = int(os.getenv("FINFETCH_PLAYWRIGHT_TIMEOUT_MS", "5000"))
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True, timeout=timeout_ms)
-            page = browser.new_page()
-            page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
-            resolved = page.url
-            browser.close()
-            if resolved and resolved != url:
-                return resolved
-    except Exception:
-        return url
-    return url
+# Finnhub timestamps are UTC epoch seconds; offsetting from a fixed epoch skips localtime()
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_timedelta = datetime.timedelta
+
+def _build_session() -> requests.Session:
+    """
+    Shared keep-alive session so concurrent fetches reuse pooled connections.
+    FINFETCH_HTTP_CACHE=1 opts into requests_cache (if installed) for conditional
+    GETs; it stays opt-in so --force still means a fresh download.
+    """
+    session = None
+    if os.getenv("FINFETCH_HTTP_CACHE") == "1":
+        try:
+            from requests_cache import CachedSession  # type: ignore
+            session = CachedSession(
+                "finfetch_http_cache",
+                backend="sqlite",
+                expire_after=3600,
+                allowable_methods=("GET",),
+                cache_control=True,
+                ignored_parameters=["token"],
+            )
+        except ImportError:
+            logger.warning("FINFETCH_HTTP_CACHE is set but requests_cache is not installed")
+    return build_session(
+        pool_connections=32,
+        pool_maxsize=32,
+        retries=3,
+        status_forcelist=(429, 500, 502, 503, 504),
+        session=session,
+    )
+
+_SESSION = _build_session()
+
+# Recent company-news results per (ticker, start, end) within this process.
+# NewsItem is frozen, so cached items are shared; callers get a fresh list.
+_NEWS_LRU: "OrderedDict[Tuple[str, int, int], List[NewsItem]]" = OrderedDict()
+_NEWS_LRU_MAX = 256
+_NEWS_LRU_LOCK = threading.Lock()
+
+def _fallback_id(item: dict, ts) -> str:
+    """Stable id for Finnhub items that arrive without one."""
+    h = blake2b(digest_size=16)
+    h.update(str(item.get("headline")).encode())
+    h.update(b"-")
+    h.update(str(ts).encode())
+    return h.hexdigest()
+
+def _news_constructor():
+    """
+    NewsItem factory for fields this module already typed (str ids, datetime).
+    Validation is skipped unless FINFETCH_STRICT is set for debug runs.
+    """
+    if os.getenv("FINFETCH_STRICT"):
+        return NewsItem
+    return NewsItem.model_construct
+
+def _build_item(item: dict, url: str, tickers: Tuple[str, ...], construct) -> NewsItem:
+    """Map one raw Finnhub news dict onto a NewsItem (shared by company and market news)."""
+    get = item.get
+    ts = get("datetime", 0)
+    # ID is usually integer, convert to str
+    news_id = str(get("id", ""))
+    if not news_id:
+        # Fallback checksum
+        news_id = _fallback_id(item, ts)
+    return construct(
+        id=news_id,
+        title=get("headline", ""),
+        url=url,
+        published_at=_EPOCH + _timedelta(seconds=ts),
+        source=get("source", "Finnhub"),
+        summary=get("summary"),
+        tickers=tickers,
+        provider="finnhub"
+    )
 
 def fetch_company_news(ticker: str, start: datetime.date, end: datetime.date) -> List[NewsItem]:
     """
@@ -72,7 +114,14 @@ def fetch_company_news(ticker: str, start: datetime.date, end: datetime.date) ->
             "Please add it to your .env file."
         )
 
-    url = f"{BASE_URL}/company-news"
+    lru_key = (ticker, start.toordinal(), end.toordinal())
+    with _NEWS_LRU_LOCK:
+        hit = _NEWS_LRU.get(lru_key)
+        if hit is not None:
+            _NEWS_LRU.move_to_end(lru_key)
+            return list(hit)
+
+    url = _URL_COMPANY
     params = {
         "symbol": ticker,
         "from": start.isoformat(),
@@ -81,11 +130,17 @@ def fetch_company_news(ticker: str, start: datetime.date, end: datetime.date) ->
     }
     
     try:
-        resp = requests.get(url, params=params, timeout=10)
+        resp = _SESSION.get(url, params=params, timeout=10)
         resp.raise_for_status()
-        data = resp.json()
+        data = _loads(resp.content)
         
         items = []
+        # Loop-invariant lookups bound to locals
+        tickers = (ticker,)
+        construct = _news_constructor()
+        append = items.append
+        resolve = resolve_finnhub_link
+        build = _build_item
         for item in data:
             # Finnhub item: { 
             #   "category": "company", 
@@ -98,39 +153,25 @@ def fetch_company_news(ticker: str, start: datetime.date, end: datetime.date) ->
             #   "summary": "...", 
             #   "url": "..." 
             # }
-            
-            ts = item.get('datetime', 0)
-            pub_date = datetime.datetime.fromtimestamp(ts)
-            
-            # ID is usually integer, convert to str
-            news_id = str(item.get('id', ''))
-            if not news_id:
-                # Fallback checksum
-                import hashlib
-                s = f"{item.get('headline')}-{ts}"
-                news_id = hashlib.md5(s.encode()).hexdigest()
 
             url = item.get('url', '')
-            url = _resolve_finnhub_link(url)
-
-            items.append(NewsItem(
-                id=news_id,
-                title=item.get('headline', ''),
-                url=url,
-                published_at=pub_date,
-                source=item.get('source', 'Finnhub'),
-                summary=item.get('summary'),
-                tickers=[ticker],
-                provider="finnhub"
-            ))
-            
-        return items
+            # Only finnhub redirect links need resolving; skip the call for the rest
+            if url and url.startswith(FINNHUB_NEWS_PREFIXES):
+                url = resolve(url)
+
+            append(build(item, url, tickers, construct))
+
+        with _NEWS_LRU_LOCK:
+            _NEWS_LRU[lru_key] = items
+            if len(_NEWS_LRU) > _NEWS_LRU_MAX:
+                _NEWS_LRU.popitem(last=False)
+        return list(items)
         
     except requests.RequestException as e:
-        logger.error(f"Finnhub request failed: {e}")
+        logger.error("Finnhub request failed: %s", e)
         raise ProviderError(f"Finnhub fetch failed: {e}")
     except Exception as e:
-        logger.error(f"Finnhub processing failed: {e}")
+        logger.error("Finnhub processing failed: %s", e)
         raise ProviderError(f"Finnhub error: {e}")
 
 def fetch_market_news(category: str = "general", min_id: int = 0) -> List[NewsItem]:
@@ -145,7 +186,7 @@ def fetch_market_news(category: str = "general", min_id: int = 0) -> List[NewsIt
             "Please add it to your .env file."
         )
 
-    url = f"{BASE_URL}/news"
+    url = _URL_MARKET
     params = {
         "category": category,
         "minId": min_id,
@@ -153,35 +194,17 @@ def fetch_market_news(category: str = "general", min_id: int = 0) -> List[NewsIt
     }
 
     try:
-        resp = requests.get(url, params=params, timeout=10)
+        resp = _SESSION.get(url, params=params, timeout=10)
         resp.raise_for_status()
-        data = resp.json()
+        data = _loads(resp.content)
 
-        items = []
-        for item in data:
-            ts = item.get("datetime", 0)
-            pub_date = datetime.datetime.fromtimestamp(ts)
-            news_id = str(item.get("id", ""))
-            if not news_id:
-                import hashlib
-                s = f"{item.get('headline')}-{ts}"
-                news_id = hashlib.md5(s.encode()).hexdigest()
-
-            items.append(NewsItem(
-                id=news_id,
-                title=item.get("headline", ""),
-                url=item.get("url", ""),
-                published_at=pub_date,
-                source=item.get("source", "Finnhub"),
-                summary=item.get("summary"),
-                tickers=[],
-                provider="finnhub"
-            ))
+        construct = _news_constructor()
+        items = [_build_item(item, item.get("url", ""), (), construct) for item in data]
 
         return items
     except requests.RequestException as e:
-        logger.error(f"Finnhub market news request failed: {e}")
+        logger.error("Finnhub market news request failed: %s", e)
         raise ProviderError(f"Finnhub market news failed: {e}")
     except Exception as e:
-        logger.error(f"Finnhub market news processing failed: {e}")
+        logger.error("Finnhub market news processing failed: %s", e)
         raise ProviderError(f"Finnhub market news error: {e}")
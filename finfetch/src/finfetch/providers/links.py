@@ -0,0 +1,183 @@
+"""
+Finnhub news redirect resolution, shared by the yahoo and finnhub providers.
+
+Finnhub links (finnhub.io/api/news?id=...) are resolved to the publisher URL
+in stages: a plain HTTP request, a curl_cffi retry with a Chrome TLS
+fingerprint, then a headless browser. Each stage raises _Unresolved when it is
+inconclusive, so its lru_cache only memoizes definitive answers.
+"""
+import atexit
+import concurrent.futures
+import functools
+import logging
+import os
+import queue
+import re
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+try:
+    # Chrome TLS fingerprint impersonation; ships with recent yfinance
+    from curl_cffi import requests as _cf_requests  # type: ignore
+except ImportError:
+    _cf_requests = None
+
+from .session import build_session
+
+logger = logging.getLogger(__name__)
+
+# Plain prefix test; str.startswith beats a regex match for the common non-finnhub case
+FINNHUB_NEWS_PREFIXES = ("https://finnhub.io/api/news?id=", "http://finnhub.io/api/news?id=")
+
+# Searched in priority order; literal-prefix patterns scan faster than one alternation
+_CANONICAL_PATS = tuple(
+    re.compile(p)
+    for p in (
+        r'rel="canonical" href="([^"]+)"',
+        r'property="og:url" content="([^"]+)"',
+        r'name="og:url" content="([^"]+)"',
+    )
+)
+
+_RESOLVE_WORKERS = 8
+_CF_IMPERSONATE = "chrome"
+_UA = "Mozilla/5.0"
+
+_SESSION = build_session(pool_connections=4, pool_maxsize=16)
+
+# Playwright's sync API is bound to the thread that started it, so one long-lived
+# worker thread owns the browser and every page load is queued to it. Resolver
+# pools come and go per call; the browser (and its driver process) does not.
+_PW_QUEUE: "queue.Queue[Optional[Tuple[str, int, concurrent.futures.Future]]]" = queue.Queue()
+_PW_THREAD: Optional[threading.Thread] = None
+_PW_THREAD_LOCK = threading.Lock()
+
+def _browser_worker() -> None:
+    pw = browser = None
+    while True:
+        job = _PW_QUEUE.get()
+        if job is None:
+            break
+        url, timeout_ms, future = job
+        if not future.set_running_or_notify_cancel():
+            continue
+        try:
+            if browser is None or not browser.is_connected():
+                if pw is None:
+                    from playwright.sync_api import sync_playwright  # type: ignore
+                    pw = sync_playwright().start()
+                browser = pw.chromium.launch(headless=True, timeout=timeout_ms)
+            page = browser.new_page()
+            try:
+                page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
+                future.set_result(page.url)
+            finally:
+                page.close()
+        except BaseException as exc:
+            future.set_exception(exc)
+    # Shutdown runs on this thread too, the only one allowed to touch these objects
+    try:
+        if browser is not None:
+            browser.close()
+        if pw is not None:
+            pw.stop()
+    except Exception as exc:
+        logger.warning("Failed to shut down Playwright: %s", exc)
+
+def _browser_goto(url: str, timeout_ms: int) -> str:
+    """Load `url` on the browser thread (started on first use); returns the final URL."""
+    global _PW_THREAD
+    with _PW_THREAD_LOCK:
+        if _PW_THREAD is None:
+            _PW_THREAD = threading.Thread(target=_browser_worker, name="finfetch-playwright", daemon=True)
+            _PW_THREAD.start()
+    future: concurrent.futures.Future = concurrent.futures.Future()
+    _PW_QUEUE.put((url, timeout_ms, future))
+    return future.result()
+
+@atexit.register
+def _stop_browser_worker() -> None:
+    with _PW_THREAD_LOCK:
+        thread = _PW_THREAD
+    if thread is not None and thread.is_alive():
+        _PW_QUEUE.put(None)
+        thread.join(timeout=10)
+
+def extract_canonical_url(html_text: str) -> Optional[str]:
+    for pat in _CANONICAL_PATS:
+        m = pat.search(html_text)
+        if m:
+            return m.group(1).strip()
+    return None
+
+def is_finnhub_redirect(url: Optional[str]) -> bool:
+    return bool(url) and url.startswith(FINNHUB_NEWS_PREFIXES)
+
+class _Unresolved(Exception):
+    """A resolution stage was inconclusive; raised so lru_cache does not memoize it."""
+
+def _resolved_from_response(url: str, resp: Any) -> str:
+    if resp.status_code in (301, 302, 303, 307, 308):
+        loc = resp.headers.get("Location")
+        if loc:
+            return loc
+    if resp.status_code == 200:
+        resolved = extract_canonical_url(resp.text)
+        return resolved or url
+    raise _Unresolved()
+
+@functools.lru_cache(maxsize=4096)
+def _resolve_http(url: str) -> str:
+    try:
+        resp = _SESSION.get(url, headers={"User-Agent": _UA}, allow_redirects=False, timeout=10)
+    except Exception as exc:
+        raise _Unresolved() from exc
+    return _resolved_from_response(url, resp)
+
+@functools.lru_cache(maxsize=4096)
+def _resolve_cf(url: str) -> str:
+    # Blocks on the plain client are usually TLS fingerprinting, not JavaScript
+    if _cf_requests is None:
+        raise _Unresolved()
+    try:
+        resp = _cf_requests.get(url, impersonate=_CF_IMPERSONATE, timeout=15, allow_redirects=False)
+    except Exception as exc:
+        raise _Unresolved() from exc
+    return _resolved_from_response(url, resp)
+
+@functools.lru_cache(maxsize=4096)
+def _resolve_playwright(url: str) -> str:
+    # Headless fallback for finnhub redirect pages; only real redirects are cached
+    try:
+        timeout_ms = int(os.getenv("FINFETCH_PLAYWRIGHT_TIMEOUT_MS", "5000"))
+        resolved = _browser_goto(url, timeout_ms)
+    except Exception as exc:
+        raise _Unresolved() from exc
+    if resolved and resolved != url:
+        return resolved
+    raise _Unresolved()
+
+def resolve_finnhub_link(url: str) -> str:
+    """Publisher URL for a finnhub redirect link; any other URL is returned unchanged."""
+    if not is_finnhub_redirect(url):
+        return url
+    for resolver in (_resolve_http, _resolve_cf, _resolve_playwright):
+        try:
+            return resolver(url)
+        except _Unresolved:
+            pass
+    return url
+
+def resolve_finnhub_links(urls: Iterable[Optional[str]]) -> Dict[str, str]:
+    """
+    Resolve the distinct finnhub redirect URLs in `urls` concurrently.
+    Each resolution is a blocking round trip, so threads overlap the waits.
+    """
+    pending = list(dict.fromkeys(u for u in urls if is_finnhub_redirect(u)))
+    if not pending:
+        return {}
+    if len(pending) == 1:
+        return {pending[0]: resolve_finnhub_link(pending[0])}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(_RESOLVE_WORKERS, len(pending))) as executor:
+        return dict(zip(pending, executor.map(resolve_finnhub_link, pending)))
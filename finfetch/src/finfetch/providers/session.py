@@ -0,0 +1,33 @@
+"""Keep-alive requests sessions shared by the HTTP providers."""
+from typing import Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+
+def build_session(
+    *,
+    pool_connections: int,
+    pool_maxsize: int,
+    retries: int = 2,
+    status_forcelist: Tuple[int, ...] = (502, 503, 504),
+    session: Optional[requests.Session] = None,
+) -> requests.Session:
+    """
+    Mount one pooled, retrying adapter for http and https on `session`
+    (a new requests.Session by default) so concurrent fetches reuse connections.
+    """
+    if session is None:
+        session = requests.Session()
+    # urllib3's list only advertises br/zstd when a decoder is installed
+    session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(total=retries, backoff_factor=0.3, status_forcelist=list(status_forcelist)),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
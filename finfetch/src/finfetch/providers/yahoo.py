@@ -1,14 +1,33 @@
+import concurrent.futures
+import hashlib
 import json
 import logging
 import re
-from datetime import date, datetime
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
 
 import pandas as pd
 import requests
 import yfinance as yf
 
+try:
+    import orjson  # type: ignore
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    # Chrome TLS fingerprint impersonation; ships with recent yfinance
+    from curl_cffi import requests as _cf_requests  # type: ignore
+except ImportError:
+    _cf_requests = None
+
 from ..errors import ProviderError
+from .links import resolve_finnhub_links
+from .session import build_session
 from ..models.fundamentals import FundamentalsSnapshot
 from ..models.news import NewsItem
 from ..models.prices import PriceBar
@@ -16,62 +35,62 @@ from ..models.transcript import Transcript, TranscriptSection
 
 logger = logging.getLogger(__name__)
 
-_FINNHUB_NEWS_RE = re.compile(r"^https?://finnhub\.io/api/news\?id=")
 _SPARSE_COL_THRESHOLD = 0.8
+_MIDNIGHT = datetime.min.time()
+
+# Recently used yf.Ticker objects, with the time each was created
+_TICKERS: "OrderedDict[str, Tuple[float, yf.Ticker]]" = OrderedDict()
+_TICKERS_MAX = 512
+_TICKER_TTL = 15 * 60
+_TICKERS_LOCK = threading.Lock()
+_CF_IMPERSONATE = "chrome"
+
+# Keep-alive session for transcript fetches
+_SESSION = build_session(pool_connections=16, pool_maxsize=64)
 _FINANCIALS_KEY_MAP = {
     "Operating Revenue": "Total Revenue",
     "Selling General And Administrative": "Selling General And Administration",
 }
 
-def _extract_canonical_url(html_text: str) -> Optional[str]:
-    for pat in (
-        r'rel=\"canonical\" href=\"([^\"]+)\"',
-        r'property=\"og:url\" content=\"([^\"]+)\"',
-        r'name=\"og:url\" content=\"([^\"]+)\"'
-    ):
-        m = re.search(pat, html_text)
-        if m:
-            return m.group(1).strip()
-    return None
-
-def _resolve_finnhub_link(url: str) -> str:
-    if not url or not _FINNHUB_NEWS_RE.match(url):
-        return url
-    try:
-        resp = requests.get(
-            url,
-            headers={"User-Agent": "Mozilla/5.0"},
-            allow_redirects=False,
-            timeout=10
-        )
-        if resp.status_code in (301, 302, 303, 307, 308):
-            loc = resp.headers.get("Location")
-            if loc:
-                return loc
-        if resp.status_code == 200:
-            resolved = _extract_canonical_url(resp.text)
-            return resolved or url
-    except Exception:
-        pass
-    # Headless fallback for finnhub redirect pages
-    try:
-        from playwright.sync_api import sync_playwright  # type: ignore
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-            page.goto(url, wait_until="domcontentloaded", timeout=15000)
-            resolved = page.url
-            browser.close()
-            if resolved and resolved != url:
-                return resolved
-    except Exception:
-        return url
-    return url
+# HTML / text patterns compiled once at import
+_LD_JSON_RE = re.compile(
+    r'<script[^>]+type="application/ld\+json"[^>]*>(.*?)</script>',
+    re.IGNORECASE | re.DOTALL,
+)
+_P_TAG_RE = re.compile(r"<p[^>]*>(.*?)</p>", re.IGNORECASE | re.DOTALL)
+_TAG_STRIP_RE = re.compile(r"<[^>]+>")
+_QUARTER_RE = re.compile(r"(Q[1-4])[\s-]*(20\d{2})", re.IGNORECASE)
+_HEADLINE_SYMBOL_RE = re.compile(r"\(([^)]+)\)")
+_HEADLINE_COMPANY_RE = re.compile(r"(.+?)\s*\(")
+_URL_SYMBOL_RE = re.compile(r"/quote/([A-Za-z\.-]+)/")
+
+def _cf_get(url: str, **kwargs: Any) -> Any:
+    return _cf_requests.get(url, impersonate=_CF_IMPERSONATE, timeout=15, **kwargs)
+
+def _get_ticker(ticker: str) -> "yf.Ticker":
+    """
+    Reuse one yf.Ticker per symbol so yfinance's cookie/crumb setup and
+    per-ticker caches persist across fetch_* calls within the process.
+    yfinance memoizes .info (and news) on the object for its whole life,
+    so entries expire after _TICKER_TTL to bound how stale they get.
+    """
+    now = time.monotonic()
+    with _TICKERS_LOCK:
+        hit = _TICKERS.get(ticker)
+        if hit is not None and now - hit[0] < _TICKER_TTL:
+            _TICKERS.move_to_end(ticker)
+            return hit[1]
+        t = yf.Ticker(ticker)
+        _TICKERS[ticker] = (now, t)
+        _TICKERS.move_to_end(ticker)
+        if len(_TICKERS) > _TICKERS_MAX:
+            _TICKERS.popitem(last=False)
+        return t
 
 def fetch_fundamentals(ticker: str) -> FundamentalsSnapshot:
     """Fetch fundamentals from Yahoo Finance."""
     try:
-        t = yf.Ticker(ticker)
+        t = _get_ticker(ticker)
         info = t.info
         
         # Validation: yfinance often returns empty dict if not found, 
@@ -95,70 +114,74 @@ def fetch_fundamentals(ticker: str) -> FundamentalsSnapshot:
         logger.error(f"Failed to fetch fundamentals for {ticker}: {e}")
         raise ProviderError(f"Yahoo fetch failed: {e}")
 
+def _bars_from_history(df: Any) -> List[PriceBar]:
+    """Build PriceBars from a yfinance OHLCV frame."""
+    # df.index is typically DatetimeIndex, but timezone aware; .date gives each bar's local date.
+    # Pull whole columns once instead of materializing a Series per row.
+    dates = df.index.date
+    opens = df['Open'].to_numpy().tolist()
+    highs = df['High'].to_numpy().tolist()
+    lows = df['Low'].to_numpy().tolist()
+    closes = df['Close'].to_numpy().tolist()
+    # int() per value (not an int64 cast) so a NaN volume still raises instead of wrapping
+    volumes = [int(v) for v in df['Volume'].to_numpy().tolist()]
+
+    # yfinance 'Close' is often adjusted or needs auto_adjust=False, so adj_close stays None
+    return [
+        PriceBar(date=d, open=o, high=h, low=l, close=c, volume=v, adj_close=None)
+        for d, o, h, l, c, v in zip(dates, opens, highs, lows, closes, volumes)
+    ]
+
 def fetch_prices(ticker: str, period: str = "1mo", interval: str = "1d") -> List[PriceBar]:
     """Fetch price history."""
     try:
-        t = yf.Ticker(ticker)
+        t = _get_ticker(ticker)
         df = t.history(period=period, interval=interval)
         
         if df.empty:
             logger.warning(f"No price data for {ticker}")
             return []
             
-        bars = []
-        # df.index is typically DatetimeIndex, but timezone aware
-        for dt, row in df.iterrows():
-            # Convert timestamp to date
-            d = dt.date()
-            
-            bars.append(PriceBar(
-                date=d,
-                open=row['Open'],
-                high=row['High'],
-                low=row['Low'],
-                close=row['Close'],
-                volume=int(row['Volume']),
-                adj_close=None # yfinance 'Close' is often adjusted or needs auto_adjust=False
-            ))
-        
-        return bars
+        return _bars_from_history(df)
     except Exception as e:
         logger.error(f"Failed to fetch prices for {ticker}: {e}")
         raise ProviderError(f"Yahoo prices failed: {e}")
 
+def _news_item_from_raw(item: Dict[str, Any], ticker: str, resolved: Dict[str, str]) -> NewsItem:
+    get = item.get
+    link = get('link', '')
+    # published is usually unix timestamp
+    pub_ts = get('providerPublishTime', 0)
+
+    # Generate a simple stable ID from uuid or link
+    uuid = get('uuid', link)
+    if not uuid:
+        unique_string = f"{get('title')}-{pub_ts}"
+        uuid = hashlib.blake2b(unique_string.encode('utf-8'), digest_size=16).hexdigest()
+    # UTC skips the local timezone lookup; digests convert for display
+    pub_date = datetime.fromtimestamp(pub_ts, tz=timezone.utc)
+
+    return NewsItem(
+        id=uuid,
+        title=get('title', ''),
+        url=resolved.get(link, link),
+        published_at=pub_date,
+        source=get('publisher', 'Yahoo'),
+        summary=None, # Yahoo news standard payload usually has titles/links
+        tickers=get('relatedTickers', [ticker]),
+        provider="yahoo"
+    )
+
 def fetch_news(ticker: str) -> List[NewsItem]:
     """Fetch news items."""
     try:
-        t = yf.Ticker(ticker)
+        t = _get_ticker(ticker)
         raw_news = t.news
         
-        items = []
-        for item in raw_news:
-            # published is usually unix timestamp
-            pub_ts = item.get('providerPublishTime', 0)
-            
-            # Generate a simple stable ID from uuid or link
-            uuid = item.get('uuid', item.get('link'))
-            if not uuid:
-                import hashlib
-                unique_string = f"{item.get('title')}-{pub_ts}"
-                uuid = hashlib.md5(unique_string.encode('utf-8')).hexdigest()
-            pub_date = datetime.fromtimestamp(pub_ts)
-            
-            url = item.get('link', '')
-            url = _resolve_finnhub_link(url)
-
-            items.append(NewsItem(
-                id=uuid,
-                title=item.get('title', ''),
-                url=url,
-                published_at=pub_date,
-                source=item.get('publisher', 'Yahoo'),
-                summary=None, # Yahoo news standard payload usually has titles/links
-                tickers=item.get('relatedTickers', [ticker]),
-                provider="yahoo"
-            ))
-        return items
+        # generator: only the distinct finnhub links are ever materialised
+        resolved = resolve_finnhub_links(item.get('link') for item in raw_news)
+        # one comprehension instead of append growth in the loop
+        return [_news_item_from_raw(item, ticker, resolved) for item in raw_news]
     except Exception as e:
         logger.error(f"Failed to fetch news for {ticker}: {e}")
         raise ProviderError(f"Yahoo news failed: {e}")
@@ -180,7 +203,7 @@ def _df_to_records(df: Any) -> List[Dict[str, Any]]:
         elif isinstance(c, datetime):
             dt = c
         elif isinstance(c, date):
-            dt = datetime.combine(c, datetime.min.time())
+            dt = datetime.combine(c, _MIDNIGHT)
         else:
             try:
                 parsed = pd.to_datetime(c, errors="coerce")
@@ -194,18 +217,28 @@ def _df_to_records(df: Any) -> List[Dict[str, Any]]:
 
     cols.sort(key=lambda x: (x[0], x[1]), reverse=True)
 
+    # Row keys and the NaN mask are computed once for the whole frame
+    keys = [str(idx) for idx in df.index]
+    missing = df.isna()
+
     for _, label, col in cols:
         record: Dict[str, Any] = {"date": label}
         series = df[col]
-        for idx, val in series.items():
-            key = str(idx)
-            if pd.isna(val):
-                record[key] = None
-            else:
-                try:
-                    record[key] = float(val)
-                except Exception:
-                    record[key] = val
+        mask = missing[col].to_numpy()
+        if series.dtype.kind in "biuf":
+            # Numeric column: convert in one shot, then blank out the NaNs
+            values = series.to_numpy(dtype=float).astype(object)
+            values[mask] = None
+            record.update(zip(keys, values.tolist()))
+        else:
+            for key, val, is_na in zip(keys, series.tolist(), mask):
+                if is_na:
+                    record[key] = None
+                else:
+                    try:
+                        record[key] = float(val)
+                    except Exception:
+                        record[key] = val
         items.append(record)
 
     return items
@@ -215,67 +248,70 @@ def _normalize_statement_records(records: List[Dict[str, Any]]) -> List[Dict[str
     if not records:
         return []
 
+    # Alias lookups once per distinct key rather than once per cell
+    canon_keys = {k: _FINANCIALS_KEY_MAP.get(k, k) for k in set().union(*records)}
     normalized: List[Dict[str, Any]] = []
     for rec in records:
         out: Dict[str, Any] = {"date": rec.get("date")}
         for key, val in rec.items():
             if key == "date":
                 continue
-            canon = _FINANCIALS_KEY_MAP.get(key, key)
+            canon = canon_keys[key]
             if canon in out and out[canon] is not None:
                 continue
             out[canon] = val
         normalized.append(out)
 
-    # Union of keys across all records (excluding date)
-    all_keys = set()
-    for rec in normalized:
-        all_keys.update(k for k in rec.keys() if k != "date")
+    # Sparsity checks run column-wise in pandas; column order follows first appearance
+    # (object dtype keeps each value exactly as produced; no int->float upcasting)
+    ndf = pd.DataFrame(normalized, dtype=object)
+    dates = ndf.pop("date")
+    missing = ndf.isna()
 
     # Drop sparse columns
-    keep_keys = set()
-    total = len(normalized)
-    for key in all_keys:
-        missing = sum(1 for rec in normalized if rec.get(key) is None)
-        if total == 0:
-            continue
-        if (missing / total) <= _SPARSE_COL_THRESHOLD:
-            keep_keys.add(key)
-
-    # Ensure consistent columns across records
-    final_records: List[Dict[str, Any]] = []
-    for rec in normalized:
-        row = {"date": rec.get("date")}
-        for key in keep_keys:
-            row[key] = rec.get(key)
-        final_records.append(row)
+    keep = missing.mean(axis=0) <= _SPARSE_COL_THRESHOLD
+    ndf = ndf.loc[:, keep]
+    missing = missing.loc[:, keep]
 
     # Drop rows that are mostly missing (likely unreliable periods)
-    if keep_keys:
-        filtered: List[Dict[str, Any]] = []
-        total_keys = len(keep_keys)
-        for row in final_records:
-            missing = sum(1 for key in keep_keys if row.get(key) is None)
-            if (missing / total_keys) <= _SPARSE_COL_THRESHOLD:
-                filtered.append(row)
-        return filtered
+    if ndf.shape[1]:
+        rows = (missing.mean(axis=1) <= _SPARSE_COL_THRESHOLD).to_numpy()
+    else:
+        rows = slice(None)
 
-    return final_records
+    # Ensure consistent columns across records, with None (not NaN) for gaps
+    ndf = ndf.where(~missing, None)
+    ndf.insert(0, "date", dates)
+    return ndf[rows].to_dict("records")
+
+
+_STATEMENT_ATTRS = (
+    "financials",
+    "quarterly_financials",
+    "balance_sheet",
+    "quarterly_balance_sheet",
+    "cashflow",
+    "quarterly_cashflow",
+)
 
 
 def fetch_financials(ticker: str) -> Dict[str, Any]:
     """Fetch annual and quarterly financial statements from Yahoo Finance."""
     try:
-        t = yf.Ticker(ticker)
+        t = _get_ticker(ticker)
 
-        income_annual = _normalize_statement_records(_df_to_records(t.financials))
-        income_quarterly = _normalize_statement_records(_df_to_records(t.quarterly_financials))
+        # Each statement property is its own Yahoo request; fetch them concurrently
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(_STATEMENT_ATTRS)) as executor:
+            frames = list(executor.map(lambda attr: getattr(t, attr), _STATEMENT_ATTRS))
 
-        balance_annual = _normalize_statement_records(_df_to_records(t.balance_sheet))
-        balance_quarterly = _normalize_statement_records(_df_to_records(t.quarterly_balance_sheet))
-
-        cash_annual = _normalize_statement_records(_df_to_records(t.cashflow))
-        cash_quarterly = _normalize_statement_records(_df_to_records(t.quarterly_cashflow))
+        (
+            income_annual,
+            income_quarterly,
+            balance_annual,
+            balance_quarterly,
+            cash_annual,
+            cash_quarterly,
+        ) = [_normalize_statement_records(_df_to_records(df)) for df in frames]
 
         return {
             "symbol": ticker,
@@ -299,19 +335,55 @@ def fetch_financials(ticker: str) -> Dict[str, Any]:
 
 
 _TRANSCRIPT_UA = "Mozilla/5.0 (finfetch transcript scraper)"
+_MAX_TRANSCRIPT_BYTES = 4 * 1024 * 1024
+
+
+def _read_capped_text(resp: Any) -> str:
+    """Read a streamed body (decompressed) and refuse pages over the size cap."""
+    too_large = ProviderError(
+        f"Yahoo transcript fetch failed: page exceeds {_MAX_TRANSCRIPT_BYTES} bytes"
+    )
+    declared = resp.headers.get("Content-Length", "")
+    if declared.isdigit() and int(declared) > _MAX_TRANSCRIPT_BYTES:
+        raise too_large
+
+    buf = bytearray()
+    for chunk in resp.iter_content(chunk_size=64 * 1024):
+        buf += chunk
+        if len(buf) > _MAX_TRANSCRIPT_BYTES:
+            raise too_large
+    return buf.decode(resp.encoding or "utf-8", errors="replace")
 
 
 def _fetch_transcript_html(url: str) -> str:
     last_error: Optional[Exception] = None
     try:
-        resp = requests.get(url, headers={"User-Agent": _TRANSCRIPT_UA}, timeout=15)
-        if resp.status_code < 400:
-            return resp.text
+        with _SESSION.get(
+            url, headers={"User-Agent": _TRANSCRIPT_UA}, timeout=15, stream=True
+        ) as resp:
+            if resp.status_code < 400:
+                return _read_capped_text(resp)
         last_error = ProviderError(f"Yahoo transcript fetch failed: HTTP {resp.status_code}")
     except requests.RequestException as exc:
         logger.error(f"Transcript fetch failed for {url}: {exc}")
         last_error = ProviderError(f"Yahoo transcript fetch failed: {exc}")
 
+    # curl_cffi retry with a Chrome TLS fingerprint before paying for a browser
+    if _cf_requests is not None:
+        try:
+            resp = _cf_get(url, stream=True)
+            try:
+                if resp.status_code < 400:
+                    return _read_capped_text(resp)
+                last_error = ProviderError(f"Yahoo transcript fetch failed: HTTP {resp.status_code}")
+            finally:
+                resp.close()
+        except ProviderError:
+            raise
+        except Exception as exc:  # pragma: no cover - network / runtime dependent
+            logger.error(f"curl_cffi transcript fetch failed for {url}: {exc}")
+            last_error = last_error or exc
+
     # Playwright fallback for sites that block non-browser clients
     try:
         from playwright.sync_api import sync_playwright  # type: ignore
@@ -338,14 +410,9 @@ def _fetch_transcript_html(url: str) -> str:
 
 
 def _extract_ld_json(html_text: str) -> Optional[Dict[str, Any]]:
-    scripts = re.findall(
-        r'<script[^>]+type="application/ld\+json"[^>]*>(.*?)</script>',
-        html_text,
-        flags=re.IGNORECASE | re.DOTALL,
-    )
-    for raw in scripts:
+    for raw in _LD_JSON_RE.findall(html_text):
         try:
-            data = json.loads(raw.strip())
+            data = _json_loads(raw.strip())
         except Exception:
             continue
         candidates = data if isinstance(data, list) else [data]
@@ -377,7 +444,7 @@ def _parse_iso_datetime(value: Optional[str]) -> Optional[datetime]:
 
 def _parse_quarter(text: str, url: str) -> Optional[str]:
     for source in (text, url):
-        match = re.search(r"(Q[1-4])[\s-]*(20\d{2})", source or "", flags=re.IGNORECASE)
+        match = _QUARTER_RE.search(source or "")
         if match:
             quarter = f"{match.group(1).upper()} {match.group(2)}"
             return quarter
@@ -388,15 +455,15 @@ def _parse_symbol_company(headline: str, url: str) -> Dict[str, Optional[str]]:
     symbol = None
     company = None
 
-    m = re.search(r"\(([^)]+)\)", headline or "")
+    m = _HEADLINE_SYMBOL_RE.search(headline or "")
     if m:
         symbol = m.group(1).strip().upper()
-    m2 = re.match(r"(.+?)\s*\(", headline or "")
+    m2 = _HEADLINE_COMPANY_RE.match(headline or "")
     if m2:
         company = m2.group(1).strip()
 
     if not symbol:
-        m = re.search(r"/quote/([A-Za-z\.-]+)/", url or "")
+        m = _URL_SYMBOL_RE.search(url or "")
         if m:
             symbol = m.group(1).upper()
 
@@ -404,7 +471,7 @@ def _parse_symbol_company(headline: str, url: str) -> Dict[str, Optional[str]]:
 
 
 def _strip_tags(text: str) -> str:
-    return re.sub(r"<[^>]+>", " ", text)
+    return _TAG_STRIP_RE.sub(" ", text)
 
 
 def _looks_like_speaker_header(text: str) -> bool:
@@ -467,37 +534,32 @@ def _parse_sections_from_body(body_text: str) -> Dict[str, Any]:
 
     flush()
 
-    speakers: List[str] = []
-    for section in sections:
-        sp = section.get("speaker") or "Narrator"
-        if sp not in speakers:
-            speakers.append(sp)
+    # order-preserving dedup; a list membership scan here is O(N^2)
+    speakers = list(dict.fromkeys(sec.get("speaker") or "Narrator" for sec in sections))
 
-    full_text = "\n\n".join(sec.get("text", "") for sec in sections if sec.get("text"))
+    return {"sections": sections, "speakers": speakers}
 
-    return {"sections": sections, "speakers": speakers, "full_text": full_text}
 
-
-def _extract_body_from_html(html_text: str) -> Optional[str]:
+def _extract_body_and_ld(html_text: str) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """Return (article body, ld+json article), scanning for the ld+json block once."""
     ld_json = _extract_ld_json(html_text)
     if ld_json and ld_json.get("articleBody"):
-        return ld_json.get("articleBody")
+        return ld_json.get("articleBody"), ld_json
 
-    paragraphs = re.findall(r"<p[^>]*>(.*?)</p>", html_text, flags=re.IGNORECASE | re.DOTALL)
-    if paragraphs:
-        cleaned = [_strip_tags(p).strip() for p in paragraphs]
-        return "\n".join([p for p in cleaned if p])
-    return None
+    cleaned = [_strip_tags(p).strip() for p in _P_TAG_RE.findall(html_text)]
+    if cleaned:
+        return "\n".join([p for p in cleaned if p]), ld_json
+    return None, ld_json
 
 
 def scrape_transcript(url: str, html_override: Optional[str] = None) -> Transcript:
     """Scrape and normalize a Yahoo Finance earnings call transcript."""
     html_text = html_override if html_override is not None else _fetch_transcript_html(url)
-    body_text = _extract_body_from_html(html_text or "")
+    body_text, ld_json = _extract_body_and_ld(html_text or "")
     if not body_text:
         raise ProviderError("Yahoo transcript parse failed: no article body found.")
 
-    ld_json = _extract_ld_json(html_text or "") or {}
+    ld_json = ld_json or {}
     headline = ld_json.get("headline", "")
 
     meta = _parse_symbol_company(headline, url)
@@ -525,7 +587,6 @@ def scrape_transcript(url: str, html_override: Optional[str] = None) -> Transcri
         published_at=_parse_iso_datetime(ld_json.get("datePublished")),
         speakers=parsed_sections["speakers"],
         sections=sections,  # type: ignore[arg-type]
-        full_text=parsed_sections["full_text"],
         raw_html=html_text,
     )
 
@@ -5,19 +5,91 @@ import hashlib
 import html
 import os
 import re
+import sqlite3
+import threading
 import time
-import urllib.request
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime, timezone
 from html.parser import HTMLParser
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import urllib3
+
+try:
+    # ~8x the throughput of trafilatura with slightly lower main-content precision;
+    # fine here since text is truncated to --max-chars and only a snippet is embedded
+    from resiliparse.extract.html2text import extract_plain_text
+    from resiliparse.parse.html import HTMLTree
+except Exception:
+    extract_plain_text = None
+    HTMLTree = None
 
 try:
     import trafilatura
 except Exception:
     trafilatura = None
 
+try:
+    from ciso8601 import parse_datetime as _parse_iso
+except Exception:
+    def _parse_iso(value: str) -> datetime:
+        # fromisoformat only accepts a trailing "Z" from Python 3.11 on
+        if value.endswith("Z"):
+            value = value[:-1] + "+00:00"
+        return datetime.fromisoformat(value)
+
+try:
+    import lxml.etree
+    import lxml.html
+except Exception:
+    lxml = None
+
+# Compiled once and searched in priority order: each has a literal prefix, which
+# sre scans for much faster than one alternation walking every position
+CANONICAL_PATS = tuple(
+    re.compile(p)
+    for p in (
+        r'rel="canonical" href="([^"]+)"',
+        r'property="og:url" content="([^"]+)"',
+        r'name="og:url" content="([^"]+)"',
+    )
+)
+
+# Digest markdown blocks; main() joins them (and the Sources list) with newlines
+HEADER_TMPL = """# Market Digest ({today})
+
+## TL;DR
+- [Add top market summary with citation](SOURCE_URL)
+- [Add second summary with citation](SOURCE_URL)
+- [Add third summary with citation](SOURCE_URL)
+
+## Key Takeaways
+- [Add cross-source takeaway with citations]
+- [Optional second takeaway]
+
+## In-Depth
+"""
+ITEM_TMPL = """### {title} — {source}
+- **Link**: {url}
+- **Scope**: {scope}  **Ticker**: {ticker}
+- **Summary (120-200 words)**: [Write summary with citations]"""
+ITEM_TEXT_TMPL = """
+
+**Extracted Text (truncated)**
+```
+{text}
+```"""
+
 CAPTURE_TAGS = {"p", "h1", "h2", "h3", "h4", "li"}
 IGNORE_TAGS = {"script", "style", "noscript"}
+# Outermost capture elements; their descendants' text is read with itertext()
+CAPTURE_XPATH = "//*[{}][not({})]".format(
+    " or ".join(f"self::{tag}" for tag in sorted(CAPTURE_TAGS)),
+    " or ".join(f"ancestor::{tag}" for tag in sorted(CAPTURE_TAGS)),
+)
 
 class TextExtractor(HTMLParser):
     def __init__(self):
@@ -60,52 +132,287 @@ class TextExtractor(HTMLParser):
         return "\n".join(self._texts)
 
 
-def read_csv(path: str) -> List[Dict[str, str]]:
-    with open(path, newline="") as f:
-        reader = csv.DictReader(f)
-        return list(reader)
+@dataclass(slots=True)
+class FetchRecord:
+    url: str
+    title: str = ""
+    source: str = ""
+    published_at: str = ""
+    scope: str = ""
+    ticker: str = ""
+    provider: str = ""
+    status: str = "ok"
+    error: str = ""
+    fetched_at: str = ""
+    text: str = ""
+    resolved_url: Optional[str] = None
+
+
+# The only columns main() reads; publisher exports often carry many more
+CSV_FIELDS = ("url", "title", "source", "published_at", "scope", "ticker", "provider")
+
+
+def published_key(record: FetchRecord) -> datetime:
+    """Sort key: published_at as naive local time, so mixed offsets order correctly."""
+    if record.published_at:
+        try:
+            dt = _parse_iso(record.published_at)
+        except ValueError:
+            return datetime.min
+        return dt.astimezone().replace(tzinfo=None) if dt.tzinfo else dt
+    return datetime.min
 
 
-def fetch_url(url: str, timeout: int, user_agent: str) -> str:
-    req = urllib.request.Request(url, headers={"User-Agent": user_agent})
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
-        return resp.read().decode("utf-8", errors="replace")
+def read_csv(path: str) -> Iterator[Dict[str, str]]:
+    """Yield rows lazily, keeping only CSV_FIELDS (missing cells read as "")."""
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None) or []
+        # last occurrence wins for duplicate headers, as with csv.DictReader
+        idx = {name: i for i, name in enumerate(header) if name in CSV_FIELDS}
+        for row in reader:
+            if not row:
+                continue
+            n = len(row)
+            yield {k: row[i] if i < n else "" for k, i in idx.items()}
+
+
+# Keep-alive pool shared by all worker threads; links cluster on a few publisher hosts
+_POOL = urllib3.PoolManager(
+    num_pools=16,
+    maxsize=16,
+    # follow redirects like urlopen did, but do not retry failed requests
+    retries=urllib3.Retry(total=None, connect=0, read=0, redirect=10),
+)
+
+
+def fetch_url(
+    url: str, timeout: int, user_agent: str, max_bytes: int = 4 * 1024 * 1024
+) -> Tuple[bytes, bool]:
+    """Return (body, truncated); truncated bodies stopped at max_bytes."""
+    resp = _POOL.request(
+        "GET", url, headers={"User-Agent": user_agent}, timeout=timeout, preload_content=False
+    )
+    try:
+        if resp.status >= 400:
+            raise RuntimeError(f"HTTP Error {resp.status}: {resp.reason}")
+        # Stream into one buffer and stop at the cap; article text and the
+        # canonical <link> sit well before the tail of oversized pages
+        buf = bytearray()
+        for chunk in resp.stream(64 * 1024):
+            buf += chunk
+            if max_bytes > 0 and len(buf) >= max_bytes:
+                del buf[max_bytes:]
+                # unread body left on the socket: drop the connection, don't pool it
+                resp.close()
+                return bytes(buf), True
+        return bytes(buf), False
+    finally:
+        resp.release_conn()
+
+
+@lru_cache(maxsize=4096)
+def url_hash(url: str) -> str:
+    # Cache key only, not security: sha1 stays so existing cache dirs remain valid
+    # and names never depend on which optional hash packages are installed
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()
 
 
 def cache_path(cache_dir: str, url: str) -> str:
-    h = hashlib.sha1(url.encode("utf-8")).hexdigest()
-    return os.path.join(cache_dir, f"{h}.html")
+    return os.path.join(cache_dir, f"{url_hash(url)}.html")
+
+
+class CanonicalMap:
+    """URL -> canonical URL ("" when the page has none), persisted next to the HTML cache."""
+
+    def __init__(self, cache_dir: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            os.path.join(cache_dir, "canonical.sqlite3"), check_same_thread=False
+        )
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS canonical (url_hash TEXT PRIMARY KEY, canonical TEXT NOT NULL)"
+            )
+
+    def get(self, url: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT canonical FROM canonical WHERE url_hash = ?", (url_hash(url),)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, url: str, canonical: Optional[str]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO canonical (url_hash, canonical) VALUES (?, ?)",
+                (url_hash(url), canonical or ""),
+            )
+
+    def close(self) -> None:
+        self._conn.close()
 
 
-def extract_text(html_text: str, max_chars: int) -> Dict[str, str]:
+@lru_cache(maxsize=1024)
+def url_host(url: str) -> str:
+    return urllib.parse.urlsplit(url).netloc.lower()
+
+
+@lru_cache(maxsize=4096)
+def strip_tracking(url: str) -> str:
+    """Drop utm_* query params and the fragment; neither changes the page served."""
+    parts = urllib.parse.urlsplit(url)
+    query = "&".join(
+        p for p in parts.query.split("&") if p and not p.lower().startswith("utm_")
+    )
+    return urllib.parse.urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, query, ""))
+
+
+class HostThrottle:
+    """Space out requests to the same host by `interval` seconds; other hosts proceed."""
+
+    def __init__(self, interval: float):
+        self.interval = max(interval, 0.0)
+        self._lock = threading.Lock()
+        self._next_at: Dict[str, float] = {}
+
+    def wait(self, url: str) -> None:
+        if not self.interval:
+            return
+        host = url_host(url)
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_at.get(host, now))
+            self._next_at[host] = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def load_html(url: str, args, throttle: HostThrottle) -> str:
+    """Read a page from the HTML cache, fetching (rate-limited per host) on a miss."""
+    path = cache_path(args.cache_dir, url)
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return f.read()
+    throttle.wait(url)
+    body, truncated = fetch_url(url, args.timeout, args.user_agent, args.max_bytes)
+    # A capped body is only good for this run; caching it would hide the rest
+    # of the page from later runs with a larger --max-bytes
+    if not truncated:
+        write_atomic(path, body)
+    return body.decode("utf-8", errors="replace")
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """Write via a temp file and rename, so a crash never leaves a partial cache entry."""
+    # pid + thread id: concurrent runs and worker threads may fill the same entry
+    tmp = f"{path}.tmp.{os.getpid()}.{threading.get_ident()}"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    if max_chars > 0 and len(text) > max_chars:
+        return text[:max_chars]
+    return text
+
+
+def extract_text(html_text: str, max_chars: int) -> Dict[str, Optional[str]]:
+    """Main text, <title> and canonical URL, taken from one parse where possible."""
+    if HTMLTree is not None:
+        try:
+            tree = HTMLTree.parse(html_text)
+            canonical = _tree_canonical(tree.document)
+            extracted = extract_plain_text(tree, main_content=True, alt_texts=False)
+            if extracted and extracted.strip():
+                return {
+                    "text": _truncate(extracted.strip(), max_chars),
+                    "title": (tree.title or "").strip(),
+                    "canonical": canonical,
+                }
+        except Exception:
+            pass
     if trafilatura is not None:
         try:
             extracted = trafilatura.extract(html_text, include_links=False, include_images=False)
             if extracted:
-                text = extracted.strip()
-                if max_chars > 0 and len(text) > max_chars:
-                    text = text[:max_chars]
-                return {"text": text, "title": ""}
+                return {
+                    "text": _truncate(extracted.strip(), max_chars),
+                    "title": "",
+                    "canonical": extract_canonical_url(html_text),
+                }
         except Exception:
             pass
-    parser = TextExtractor()
-    parser.feed(html_text)
-    text = parser.get_text().strip()
+    text, title, canonical = _extract_with_tree(html_text)
     if not text:
         text = " ".join(html_text.split())
     text = html.unescape(text)
-    if max_chars > 0 and len(text) > max_chars:
-        text = text[:max_chars]
-    return {"text": text, "title": parser.title.strip()}
+    return {"text": _truncate(text, max_chars), "title": title, "canonical": canonical}
+
+
+# Same priority order as CANONICAL_PATS: (CSS selector, attribute holding the URL)
+CANONICAL_SELECTORS = (
+    ('link[rel="canonical"]', "href"),
+    ('meta[property="og:url"]', "content"),
+    ('meta[name="og:url"]', "content"),
+)
+
+
+def _tree_canonical(document) -> Optional[str]:
+    for selector, attr in CANONICAL_SELECTORS:
+        node = document.query_selector(selector)
+        value = node.getattr(attr) if node is not None else None
+        if value and value.strip():
+            return value.strip()
+    return None
+
+
+_CAPTURE_TOPS = lxml.etree.XPath(CAPTURE_XPATH) if lxml is not None else None
+
+
+def _extract_with_tree(html_text: str):
+    """Capture-tag text, <title> and canonical URL, via lxml when available, else the stdlib TextExtractor."""
+    if lxml is not None:
+        try:
+            doc = lxml.html.fromstring(html_text)
+            # Empty ignored elements in place; their tails stay separate text nodes
+            for el in list(doc.iter(*IGNORE_TAGS)):
+                el.text = None
+                del el[:]
+            texts = (t.strip() for el in _CAPTURE_TOPS(doc) for t in el.itertext())
+            return (
+                "\n".join(t for t in texts if t),
+                (doc.findtext(".//title") or "").strip(),
+                _lxml_canonical(doc),
+            )
+        except Exception:
+            pass
+    parser = TextExtractor()
+    parser.feed(html_text)
+    return parser.get_text().strip(), parser.title.strip(), extract_canonical_url(html_text)
+
+
+def _lxml_canonical(doc) -> Optional[str]:
+    for selector, attr in CANONICAL_SELECTORS:
+        tag, _, cond = selector.partition("[")
+        node = doc.find(f".//{tag}[@{cond}")
+        value = node.get(attr) if node is not None else None
+        if value and value.strip():
+            return value.strip()
+    return None
 
 
 def extract_canonical_url(html_text: str) -> Optional[str]:
-    for pat in (
-        r'rel="canonical" href="([^"]+)"',
-        r'property="og:url" content="([^"]+)"',
-        r'name="og:url" content="([^"]+)"'
-    ):
-        m = re.search(pat, html_text)
+    for pat in CANONICAL_PATS:
+        m = pat.search(html_text)
         if m:
             return m.group(1).strip()
     return None
@@ -117,10 +424,12 @@ def main():
     ap.add_argument("--out", default="digest.md", help="Output markdown path")
     ap.add_argument("--cache-dir", default=".link_cache", help="HTML cache directory")
     ap.add_argument("--limit", type=int, default=0, help="Limit number of URLs")
-    ap.add_argument("--sleep", type=float, default=0.5, help="Delay between requests")
+    ap.add_argument("--sleep", type=float, default=0.5, help="Delay between requests to the same host")
+    ap.add_argument("--concurrency", type=int, default=8, help="Max pages fetched in parallel")
     ap.add_argument("--timeout", type=int, default=15, help="Request timeout in seconds")
     ap.add_argument("--user-agent", default="Mozilla/5.0 (Codex Digest Bot)", help="User agent")
     ap.add_argument("--max-chars", type=int, default=12000, help="Max chars of extracted text")
+    ap.add_argument("--max-bytes", type=int, default=4 * 1024 * 1024, help="Max bytes read per page (0 = no cap)")
     ap.add_argument("--snippet-chars", type=int, default=1200, help="Snippet length to embed in markdown")
     args = ap.parse_args()
 
@@ -138,99 +447,79 @@ def main():
         if args.limit and len(output) >= args.limit:
             break
 
-        record = {
-            "url": url,
-            "title": row.get("title", "").strip(),
-            "source": row.get("source", "").strip(),
-            "published_at": row.get("published_at", "").strip(),
-            "scope": row.get("scope", "").strip(),
-            "ticker": row.get("ticker", "").strip(),
-            "provider": row.get("provider", "").strip(),
-            "status": "ok",
-            "error": "",
-            "fetched_at": datetime.now(timezone.utc).isoformat(),
-            "text": ""
-        }
-
+        output.append(FetchRecord(
+            url=url,
+            title=row.get("title", "").strip(),
+            source=row.get("source", "").strip(),
+            published_at=row.get("published_at", "").strip(),
+            scope=row.get("scope", "").strip(),
+            ticker=row.get("ticker", "").strip(),
+            provider=row.get("provider", "").strip(),
+            fetched_at=datetime.now(timezone.utc).isoformat(),
+        ))
+
+    throttle = HostThrottle(args.sleep)
+    cmap = CanonicalMap(args.cache_dir)
+
+    def process(record: FetchRecord) -> None:
+        url = record.url
         try:
-            path = cache_path(args.cache_dir, url)
-            if os.path.exists(path):
-                with open(path, "r", encoding="utf-8", errors="replace") as f:
-                    html_text = f.read()
+            extracted = None
+            known = cmap.get(url)
+            if known is None:
+                # One parse yields the text and the canonical URL together
+                extracted = extract_text(load_html(url, args, throttle), args.max_chars)
+                canonical = extracted.get("canonical")
+                cmap.put(url, canonical)
             else:
-                html_text = fetch_url(url, args.timeout, args.user_agent)
-                with open(path, "w", encoding="utf-8", errors="replace") as f:
-                    f.write(html_text)
-                time.sleep(args.sleep)
-
-            extracted = extract_text(html_text, args.max_chars)
-            canonical = extract_canonical_url(html_text)
+                canonical = known or None
             if canonical and canonical != url:
-                record["resolved_url"] = canonical
-                try:
-                    cpath = cache_path(args.cache_dir, canonical)
-                    if os.path.exists(cpath):
-                        with open(cpath, "r", encoding="utf-8", errors="replace") as f:
-                            html_text = f.read()
-                    else:
-                        html_text = fetch_url(canonical, args.timeout, args.user_agent)
-                        with open(cpath, "w", encoding="utf-8", errors="replace") as f:
-                            f.write(html_text)
-                        time.sleep(args.sleep)
-                    extracted = extract_text(html_text, args.max_chars)
-                except Exception:
-                    pass
-            if extracted.get("title") and not record["title"]:
-                record["title"] = extracted["title"]
-            record["text"] = extracted.get("text", "")
+                record.resolved_url = canonical
+                # A canonical differing only by tracking params is the page we already have
+                if strip_tracking(canonical) != strip_tracking(url):
+                    try:
+                        extracted = extract_text(load_html(canonical, args, throttle), args.max_chars)
+                    except Exception:
+                        pass
+            if extracted is None:
+                extracted = extract_text(load_html(url, args, throttle), args.max_chars)
+            if extracted.get("title") and not record.title:
+                record.title = extracted["title"]
+            record.text = extracted.get("text", "")
         except Exception as e:
-            record["status"] = "error"
-            record["error"] = str(e)
+            record.status = "error"
+            record.error = str(e)
 
-        output.append(record)
+    # Fetches are I/O bound; records are filled in place so output order is unchanged
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as executor:
+        list(executor.map(process, output))
+    cmap.close()
 
-    output.sort(key=lambda x: x.get("published_at") or "", reverse=True)
+    output.sort(key=published_key, reverse=True)
 
-    lines = []
     today = datetime.now(timezone.utc).date().isoformat()
-    lines.append(f"# Market Digest ({today})")
-    lines.append("")
-    lines.append("## TL;DR")
-    lines.append("- [Add top market summary with citation](SOURCE_URL)")
-    lines.append("- [Add second summary with citation](SOURCE_URL)")
-    lines.append("- [Add third summary with citation](SOURCE_URL)")
-    lines.append("")
-    lines.append("## Key Takeaways")
-    lines.append("- [Add cross-source takeaway with citations]")
-    lines.append("- [Optional second takeaway]")
-    lines.append("")
-    lines.append("## In-Depth")
-    lines.append("")
+    lines = [HEADER_TMPL.format(today=today)]
 
+    # One formatted block per record instead of a list entry per markdown line
     for item in output:
-        title = item.get("title") or item.get("url")
-        source = item.get("source") or "Unknown"
-        url = item.get("resolved_url") or item.get("url") or ""
-        scope = item.get("scope") or ""
-        ticker = item.get("ticker") or ""
-        text = (item.get("text") or "").strip()
+        text = item.text.strip()
         if args.snippet_chars > 0 and len(text) > args.snippet_chars:
             text = text[:args.snippet_chars]
-        lines.append(f"### {title} — {source}")
-        lines.append(f"- **Link**: {url}")
-        lines.append(f"- **Scope**: {scope}  **Ticker**: {ticker}")
-        lines.append("- **Summary (120-200 words)**: [Write summary with citations]")
+        block = ITEM_TMPL.format_map({
+            "title": item.title or item.url,
+            "source": item.source or "Unknown",
+            "url": item.resolved_url or item.url,
+            "scope": item.scope,
+            "ticker": item.ticker,
+        })
         if text:
-            lines.append("")
-            lines.append("**Extracted Text (truncated)**")
-            lines.append("```")
-            lines.append(text)
-            lines.append("```")
+            block += ITEM_TEXT_TMPL.format(text=text)
+        lines.append(block)
         lines.append("")
 
     lines.append("## Sources")
     for item in output:
-        url = item.get("resolved_url") or item.get("url") or ""
+        url = item.resolved_url or item.url
         if url:
             lines.append(f"- {url}")
 
@@ -2,6 +2,13 @@
 import argparse
 from pathlib import Path
 
+try:
+    from markdown_it import MarkdownIt  # type: ignore
+    # CommonMark already covers fenced code; tables are the only extension we use
+    _MD_PARSER = MarkdownIt("commonmark").enable("table")
+except ImportError:
+    _MD_PARSER = None
+
 HTML_TEMPLATE = """<!doctype html>
 <html lang=\"en\">
 <head>
@@ -71,6 +78,8 @@ HTML_TEMPLATE = """<!doctype html>
 """
 
 def markdown_to_html(md: str) -> str:
+    if _MD_PARSER is not None:
+        return _MD_PARSER.render(md)
     try:
         import markdown  # type: ignore
         return markdown.markdown(md, extensions=["fenced_code"])
@@ -5,11 +5,15 @@ from pathlib import Path
 
 import yaml
 
+# libyaml-backed loader when PyYAML was built with it; same safe semantics
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def load_tickers(path: Path):
     if not path.exists():
         return []
-    data = yaml.safe_load(path.read_text()) or {}
+    with path.open("rb") as f:
+        data = yaml.load(f, Loader=_YAML_LOADER) or {}
     tickers = (data.get("market") or {}).get("tickers") or []
     return [t.strip().upper() for t in tickers if isinstance(t, str) and t.strip()]
 
@@ -0,0 +1,67 @@
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "finfetch" / "src"
+sys.path.insert(0, str(SRC))
+
+from finfetch.cache import sqlite as cache_sqlite
+from finfetch.cache.sqlite import SQLiteCache
+
+
+class TestSQLiteCache(unittest.TestCase):
+    def test_get_many_returns_present_keys(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = SQLiteCache(db_path=str(Path(tmpdir) / "cache.db"))
+            cache.put("a", {"x": 1})
+            cache.put("b", [1, 2, 3])
+
+            results = cache.get_many(["a", "b", "missing", "a"])
+
+            self.assertEqual(results, {"a": {"x": 1}, "b": [1, 2, 3]})
+            self.assertEqual(cache.get_many([]), {})
+
+    def test_get_many_chunks_large_key_lists(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = SQLiteCache(db_path=str(Path(tmpdir) / "cache.db"))
+            keys = [f"k{i}" for i in range(cache_sqlite._GET_MANY_CHUNK * 2 + 5)]
+            for i, key in enumerate(keys):
+                cache.put(key, i)
+
+            results = cache.get_many(keys)
+
+            self.assertEqual(len(results), len(keys))
+            self.assertEqual(results[keys[-1]], len(keys) - 1)
+
+    def test_writable_cache_keeps_one_connection(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = SQLiteCache(db_path=str(Path(tmpdir) / "cache.db"))
+            conn = cache._connect()
+            cache.put("a", 1)
+            self.assertEqual(cache.get("a"), 1)
+            self.assertIs(cache._connect(), conn)
+
+            cache.close()
+            self.assertEqual(cache.get("a"), 1)
+
+    def test_readonly_cache_reads_without_writing(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = str(Path(tmpdir) / "cache.db")
+            missing = SQLiteCache(db_path=db_path, readonly=True)
+            self.assertIsNone(missing.get("a"))
+            self.assertEqual(missing.get_many(["a"]), {})
+            self.assertFalse(Path(db_path).exists())
+
+            SQLiteCache(db_path=db_path).put("a", {"x": 1})
+            readonly = SQLiteCache(db_path=db_path, readonly=True)
+            readonly.put("b", 2)
+
+            self.assertEqual(readonly.get("a"), {"x": 1})
+            self.assertIsNone(readonly.get("b"))
+            self.assertIs(readonly._connect(), readonly._connect())
+
+
+if __name__ == "__main__":
+    unittest.main()
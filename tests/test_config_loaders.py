@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "finfetch" / "src"
+sys.path.insert(0, str(SRC))
+
+from finfetch.errors import ValidationError
+from finfetch.market import load_market
+from finfetch.portfolio import load_portfolio
+
+
+class TestConfigLoaders(unittest.TestCase):
+    def test_load_market_normalizes_tickers(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "market.yaml"
+            path.write_text("market:\n  name: Tech\n  tickers: [aapl, ' msft ']\n")
+
+            self.assertEqual(load_market(str(path)), {"name": "Tech", "tickers": ["AAPL", "MSFT"]})
+
+    def test_load_portfolio_rejects_invalid_yaml(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "portfolio.yaml"
+            path.write_text("portfolio: [\n")
+
+            with self.assertRaises(ValidationError):
+                load_portfolio(str(path))
+
+    def test_load_market_rejects_unreadable_path(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with self.assertRaises(ValidationError):
+                load_market(tmpdir)
+
+    def test_cached_result_is_isolated_and_invalidated_on_change(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "portfolio.yaml"
+            path.write_text("portfolio:\n  tickers: [AAPL]\n")
+
+            first = load_portfolio(str(path))
+            first["tickers"].append("MUTATED")
+            self.assertEqual(load_portfolio(str(path))["tickers"], ["AAPL"])
+
+            path.write_text("portfolio:\n  tickers: [AAPL, NVDA]\n")
+            st = path.stat()
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+            self.assertEqual(load_portfolio(str(path))["tickers"], ["AAPL", "NVDA"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -127,6 +127,39 @@ class TestWeeklyDigest(unittest.TestCase):
 
             self.assertIn("Sentiment: Positive (Finnhub, score 0.70)", content)
 
+    def test_normalize_news_mixes_aware_and_naive_timestamps(self):
+        aware = datetime.datetime(2026, 1, 5, 12, 0, tzinfo=datetime.timezone.utc)
+        naive = aware.astimezone().replace(tzinfo=None) - datetime.timedelta(hours=1)
+        items = weekly._normalize_news(
+            [{"id": "naive", "title": "older", "published_at": naive.isoformat()}],
+            [{"id": "aware", "title": "newer", "published_at": aware.isoformat()}],
+        )
+
+        self.assertEqual([i["id"] for i in items], ["aware", "naive"])
+        self.assertIsNone(items[0]["published_at"].tzinfo)
+
+    def test_parse_datetime_accepts_pydantic_utc_suffix(self):
+        expected = datetime.datetime(2026, 1, 5, 12, 0, tzinfo=datetime.timezone.utc)
+        self.assertEqual(
+            weekly._parse_datetime("2026-01-05T12:00:00Z"),
+            expected.astimezone().replace(tzinfo=None),
+        )
+
+    def test_sentiment_helpers_accept_raw_news_items(self):
+        now = datetime.datetime.now()
+        raw = [
+            {"title": "Apple beats estimates", "published_at": now},
+            {"title": "Apple shares slump on weak outlook", "published_at": now},
+            {"title": "Apple holds annual meeting"},
+        ]
+
+        # risks/catalysts labels come straight from _item_sentiment
+        self.assertEqual([weekly._item_sentiment(i) for i in raw], [1, -1, 0])
+        self.assertEqual(weekly._weighted_sentiment(raw[:1])[0], "Positive")
+        label, score = weekly._weighted_sentiment(raw)
+        self.assertEqual(label, "Neutral")
+        self.assertAlmostEqual(score, 0.0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,61 @@
+import argparse
+import http.server
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+import fetch_links
+
+BODY = b"<html><body><p>" + b"Body text " * 20 + b"</p></body></html>"
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestFetchLinksCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}/page.html"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def _args(self, cache_dir, max_bytes):
+        return argparse.Namespace(
+            cache_dir=cache_dir, timeout=5, user_agent="test", max_bytes=max_bytes
+        )
+
+    def test_truncated_body_is_not_cached(self):
+        throttle = fetch_links.HostThrottle(0)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            capped = fetch_links.load_html(self.url, self._args(tmpdir, 60), throttle)
+            self.assertEqual(len(capped), 60)
+            self.assertFalse(os.path.exists(fetch_links.cache_path(tmpdir, self.url)))
+
+            full = fetch_links.load_html(self.url, self._args(tmpdir, 0), throttle)
+            self.assertEqual(full, BODY.decode())
+            with open(fetch_links.cache_path(tmpdir, self.url), "rb") as f:
+                self.assertEqual(f.read(), BODY)
+
+
+if __name__ == "__main__":
+    unittest.main()
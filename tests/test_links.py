@@ -0,0 +1,105 @@
+import threading
+import types
+import unittest
+from pathlib import Path
+from unittest import mock
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "finfetch" / "src"
+sys.path.insert(0, str(SRC))
+
+from finfetch.providers import finnhub, links, yahoo
+
+
+class _Resp:
+    def __init__(self, status_code, headers=None, text=""):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = text
+
+
+class TestFinnhubLinkResolution(unittest.TestCase):
+    def setUp(self):
+        for stage in (links._resolve_http, links._resolve_cf, links._resolve_playwright):
+            stage.cache_clear()
+
+    def test_non_finnhub_urls_skip_the_network(self):
+        with mock.patch.object(links._SESSION, "get") as get:
+            self.assertEqual(links.resolve_finnhub_link("https://example.com/a"), "https://example.com/a")
+            self.assertEqual(links.resolve_finnhub_links(["", None, "https://example.com/a"]), {})
+        get.assert_not_called()
+
+    def test_redirect_and_canonical_responses(self):
+        redirect = "https://finnhub.io/api/news?id=1"
+        page = "https://finnhub.io/api/news?id=2"
+        responses = {
+            redirect: _Resp(302, {"Location": "https://pub.example/story"}),
+            page: _Resp(200, text='<link rel="canonical" href="https://pub.example/other">'),
+        }
+        with mock.patch.object(links._SESSION, "get", side_effect=lambda url, **kw: responses[url]):
+            resolved = links.resolve_finnhub_links([redirect, page, redirect])
+
+        self.assertEqual(
+            resolved,
+            {redirect: "https://pub.example/story", page: "https://pub.example/other"},
+        )
+
+    def test_browser_work_stays_on_one_thread(self):
+        calls = []
+
+        class Page:
+            url = "https://pub.example/browser"
+
+            def goto(self, url, **kw):
+                calls.append(("goto", threading.get_ident()))
+
+            def close(self):
+                pass
+
+        class Browser:
+            def is_connected(self):
+                return True
+
+            def new_page(self):
+                return Page()
+
+            def close(self):
+                calls.append(("close", threading.get_ident()))
+
+        class Playwright:
+            chromium = types.SimpleNamespace(launch=lambda **kw: Browser())
+
+            def stop(self):
+                calls.append(("stop", threading.get_ident()))
+
+        fake = types.ModuleType("playwright.sync_api")
+        fake.sync_playwright = lambda: types.SimpleNamespace(start=Playwright)
+        urls = [f"https://finnhub.io/api/news?id={i}" for i in range(4)]
+        with mock.patch.dict(sys.modules, {"playwright": types.ModuleType("playwright"), "playwright.sync_api": fake}), \
+                mock.patch.object(links._SESSION, "get", side_effect=OSError("blocked")), \
+                mock.patch.object(links, "_cf_requests", None), \
+                mock.patch.object(links, "_PW_THREAD", None), \
+                mock.patch.object(links, "_PW_QUEUE", links.queue.Queue()):
+            resolved = links.resolve_finnhub_links(urls)
+            worker = links._PW_THREAD
+            links._stop_browser_worker()
+
+        self.assertEqual(resolved, {u: "https://pub.example/browser" for u in urls})
+        self.assertFalse(worker.is_alive())
+        self.assertEqual([c[0] for c in calls], ["goto"] * 4 + ["close", "stop"])
+        self.assertEqual({c[1] for c in calls}, {worker.ident})
+
+    def test_providers_share_the_resolver(self):
+        self.assertIs(finnhub.resolve_finnhub_link, links.resolve_finnhub_link)
+        self.assertIs(yahoo.resolve_finnhub_links, links.resolve_finnhub_links)
+
+    def test_provider_sessions_come_from_one_factory(self):
+        for session, pool in ((links._SESSION, 16), (yahoo._SESSION, 64), (finnhub._SESSION, 32)):
+            adapter = session.get_adapter("https://example.com")
+            self.assertIs(adapter, session.get_adapter("http://example.com"))
+            self.assertEqual(adapter._pool_maxsize, pool)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -45,6 +45,42 @@ class TestTranscriptParsing(unittest.TestCase):
         self.assertGreaterEqual(len(transcript.sections), 2)
         self.assertIn("Good day", transcript.full_text)
 
+    def test_parse_sections_speaker_lines(self):
+        body = "\n".join([
+            "Intro line",
+            "",
+            "Jane Doe -- CFO: Revenue grew.",
+            "  Margins expanded.  ",
+            "John Smith - VP -- Sales: not a speaker line",
+            "Analyst",
+            "Q3 guidance: raised",
+        ])
+        parsed = yahoo._parse_sections_from_body(body)
+
+        self.assertEqual(
+            parsed["sections"],
+            [
+                {
+                    "speaker": "Jane Doe",
+                    "role": "CFO",
+                    "text": "Revenue grew. Margins expanded. John Smith - VP -- Sales: not a speaker line",
+                },
+                {"speaker": "Analyst", "role": None, "text": "Q3 guidance: raised"},
+            ],
+        )
+        self.assertEqual(parsed["speakers"], ["Jane Doe", "Analyst"])
+
+    def test_paragraph_fallback_is_plain_regex_output(self):
+        html = (
+            "<html><body><P class=x>Operator: Hello &amp; welcome</P>"
+            "<p>  <b>Jane Doe</b> -- CFO: Thanks  </p></body></html>"
+        )
+        body, ld_json = yahoo._extract_body_and_ld(html)
+
+        # No optional parser backend: entities and inner spacing are left as scraped
+        self.assertIsNone(ld_json)
+        self.assertEqual(body, "Operator: Hello &amp; welcome\nJane Doe  -- CFO: Thanks")
+
     def test_store_and_export(self):
         transcript = yahoo.scrape_transcript(TEST_URL, html_override=SAMPLE_HTML)
 
@@ -0,0 +1,53 @@
+import datetime
+import unittest
+from pathlib import Path
+import sys
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "finfetch" / "src"
+sys.path.insert(0, str(SRC))
+
+from finfetch.providers import yahoo
+
+
+def _history_frame(volumes):
+    index = pd.DatetimeIndex(
+        ["2026-01-05 00:00:00-05:00", "2026-01-06 00:00:00-05:00"], name="Date"
+    )
+    return pd.DataFrame(
+        {
+            "Open": [10.0, 11.0],
+            "High": [12.0, 13.5],
+            "Low": [9.5, 10.5],
+            "Close": [11.0, 13.0],
+            "Volume": volumes,
+        },
+        index=index,
+    )
+
+
+class TestYahooPriceBars(unittest.TestCase):
+    def test_bars_map_columns_and_local_dates(self):
+        bars = yahoo._bars_from_history(_history_frame([1000, 2500]))
+
+        self.assertEqual([b.date for b in bars], [datetime.date(2026, 1, 5), datetime.date(2026, 1, 6)])
+        self.assertEqual(bars[1].model_dump(mode="json"), {
+            "date": "2026-01-06",
+            "open": 11.0,
+            "high": 13.5,
+            "low": 10.5,
+            "close": 13.0,
+            "volume": 2500,
+            "adj_close": None,
+        })
+        self.assertIsInstance(bars[0].volume, int)
+
+    def test_missing_volume_raises_instead_of_wrapping(self):
+        with self.assertRaises(ValueError):
+            yahoo._bars_from_history(_history_frame([1000, float("nan")]))
+
+
+if __name__ == "__main__":
+    unittest.main()